@@ -7,9 +7,21 @@ import typer
 from .auth import NotLoggedInError, get_api_key, get_current_token, is_using_api_key
 from .config import BACKEND_BASE_URL
 from .crypto import decrypt_payload, encrypt_payload, ensure_agent_keypair
+from .http_pool import LoopBoundClient
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP client for API requests, one per event loop
+_api_http = LoopBoundClient(
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+)
+
+
+def _get_api_http() -> httpx.AsyncClient:
+    """Get the shared API HTTP client for the running event loop"""
+    return _api_http.get()
+
 
 class ApiClient:
     """HTTP client for hitl-shin-relay API with automatic JWT authentication"""
@@ -17,9 +29,20 @@ class ApiClient:
     def __init__(self, base_url: str | None = None):
         self.base_url = base_url or BACKEND_BASE_URL
         self.timeout = 30.0
+        self._headers: dict[str, str] | None = None
 
     def _get_headers(self) -> dict[str, str]:
-        """Get headers with authentication token"""
+        """Get headers with authentication token, built once per client"""
+        if self._headers is None:
+            self._headers = self._build_headers()
+        return self._headers
+
+    def invalidate_headers(self) -> None:
+        """Drop cached headers so the next request re-reads credentials"""
+        self._headers = None
+
+    def _build_headers(self) -> dict[str, str]:
+        """Build headers from the configured API key or login token"""
         if is_using_api_key():
             api_key = get_api_key()
             return {
@@ -40,45 +63,47 @@ class ApiClient:
 
     async def get(self, path: str, timeout: float | None = None) -> dict[str, Any]:
         """Make GET request to API"""
-        async with httpx.AsyncClient(timeout=timeout or self.timeout) as client:
-            response = await client.get(
-                f"{self.base_url}{path}",
-                headers=self._get_headers()
-            )
-            return self._handle_response(response)
+        response = await _get_api_http().get(
+            f"{self.base_url}{path}",
+            headers=self._get_headers(),
+            timeout=timeout or self.timeout
+        )
+        return self._handle_response(response)
 
     async def post(self, path: str, data: dict[str, Any] | None = None, timeout: float | None = None) -> dict[str, Any]:
         """Make POST request to API"""
-        async with httpx.AsyncClient(timeout=timeout or self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}{path}",
-                json=data,
-                headers=self._get_headers()
-            )
-            return self._handle_response(response)
+        response = await _get_api_http().post(
+            f"{self.base_url}{path}",
+            json=data,
+            headers=self._get_headers(),
+            timeout=timeout or self.timeout
+        )
+        return self._handle_response(response)
 
     async def put(self, path: str, data: dict[str, Any] | None = None, timeout: float | None = None) -> dict[str, Any]:
         """Make PUT request to API"""
-        async with httpx.AsyncClient(timeout=timeout or self.timeout) as client:
-            response = await client.put(
-                f"{self.base_url}{path}",
-                json=data,
-                headers=self._get_headers()
-            )
-            return self._handle_response(response)
+        response = await _get_api_http().put(
+            f"{self.base_url}{path}",
+            json=data,
+            headers=self._get_headers(),
+            timeout=timeout or self.timeout
+        )
+        return self._handle_response(response)
 
     async def delete(self, path: str, timeout: float | None = None) -> dict[str, Any]:
         """Make DELETE request to API"""
-        async with httpx.AsyncClient(timeout=timeout or self.timeout) as client:
-            response = await client.delete(
-                f"{self.base_url}{path}",
-                headers=self._get_headers()
-            )
-            return self._handle_response(response)
+        response = await _get_api_http().delete(
+            f"{self.base_url}{path}",
+            headers=self._get_headers(),
+            timeout=timeout or self.timeout
+        )
+        return self._handle_response(response)
 
     def _handle_response(self, response: httpx.Response) -> dict[str, Any]:
         """Handle API response and errors"""
         if response.status_code == 401:
+            # The cached credentials were rejected; re-read them on the next request
+            self.invalidate_headers()
             logger.error("Authentication failed - token may be expired or invalid")
             typer.echo("Error: Authentication failed. Please run 'hitl-cli login' again.")
             raise typer.Exit(1)
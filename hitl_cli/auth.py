@@ -7,9 +7,12 @@ import os
 import secrets
 import socketserver
 import stat
+import tempfile
 import threading
 import time
 import webbrowser
+from collections.abc import Callable
+from pathlib import Path
 from urllib.parse import parse_qs, urlencode, urlparse
 
 import httpx
@@ -23,6 +26,18 @@ from .config import (
     OAUTH_TOKEN_FILE,
     TOKEN_FILE,
 )
+from .http_pool import LoopBoundClient
+
+# Parsed OAuth token keyed by (path, inode, mtime_ns, size) so repeated loads skip the JSON parse
+_oauth_token_cache: tuple[tuple[str, int, int, int], dict[str, str]] | None = None
+
+# Shared HTTP client for the OAuth endpoints, one per event loop
+_oauth_http = LoopBoundClient(timeout=30.0, limits=httpx.Limits(max_connections=20, max_keepalive_connections=20))
+
+
+def _get_oauth_http() -> httpx.AsyncClient:
+    """Get the shared OAuth HTTP client for the running event loop"""
+    return _oauth_http.get()
 
 
 class NotLoggedInError(Exception):
@@ -32,11 +47,25 @@ class NotLoggedInError(Exception):
 
 def ensure_secure_storage():
     """Ensure the config directory exists with proper permissions"""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    CONFIG_DIR.mkdir(mode=stat.S_IRWXU, parents=True, exist_ok=True)
     # Set directory permissions to 700 (owner read/write/execute only)
     os.chmod(CONFIG_DIR, stat.S_IRWXU)
 
 
+def _write_secure_json(path: Path, data: dict) -> None:
+    """Atomically write JSON to path, creating it with 600 permissions from the start"""
+    # mkstemp creates a fresh, uniquely named file with 600 permissions, so concurrent
+    # writers never share a temp file and a stale one from a crash is never reused
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 def save_token(token: str, google_id_token: str | None = None):
     """Save JWT token and optionally Google ID token to secure storage"""
     ensure_secure_storage()
@@ -54,11 +83,7 @@ def save_token(token: str, google_id_token: str | None = None):
         "access_token": token,
         "google_id_token": google_id_token or existing_data.get("google_id_token")
     }
-    with open(TOKEN_FILE, "w") as f:
-        json.dump(token_data, f)
-
-    # Set file permissions to 600 (owner read/write only)
-    os.chmod(TOKEN_FILE, stat.S_IRUSR | stat.S_IWUSR)
+    _write_secure_json(TOKEN_FILE, token_data)
 
 
 def load_token() -> str | None:
@@ -173,88 +198,107 @@ class OAuthCallbackHandler(http.server.BaseHTTPRequestHandler):
         pass
 
 
+# Fixed fields of the RFC 7591 registration request; only client_name and redirect_uris vary
+_REGISTRATION_TEMPLATE = {
+    "grant_types": ["authorization_code"],
+    "response_types": ["code"],
+    "token_endpoint_auth_method": "client_secret_post",
+    "scope": "openid profile email"
+}
+
+
 class OAuthDynamicClient:
     """OAuth 2.1 dynamic client with PKCE support"""
 
+    __slots__ = ("base_url",)
+
+    # Fixed loopback redirect registered with the backend
+    CALLBACK_PORT = 8080
+    CALLBACK_PATH = "/callback"
+    REDIRECT_URI = f"http://localhost:{CALLBACK_PORT}{CALLBACK_PATH}"
+
     def __init__(self):
         self.base_url = BACKEND_BASE_URL
-        self.callback_port = 8080
-        self.callback_path = "/callback"
-        self.redirect_uri = f"http://localhost:{self.callback_port}{self.callback_path}"
 
     def _generate_code_verifier(self) -> str:
         """Generate PKCE code verifier (RFC 7636)"""
-        return base64.urlsafe_b64encode(secrets.token_bytes(32)).decode().rstrip('=')
+        return secrets.token_urlsafe(32)
 
     def _generate_code_challenge(self, code_verifier: str) -> str:
         """Generate PKCE code challenge from verifier (RFC 7636)"""
         digest = hashlib.sha256(code_verifier.encode()).digest()
-        return base64.urlsafe_b64encode(digest).decode().rstrip('=')
+        return base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
 
     def _generate_state(self) -> str:
         """Generate OAuth state parameter"""
-        return base64.urlsafe_b64encode(secrets.token_bytes(32)).decode().rstrip('=')
+        return secrets.token_urlsafe(32)
 
-    async def _register_client(self, agent_name: str) -> dict[str, str]:
-        """Register dynamic OAuth client (RFC 7591)"""
+    async def _register_client(self, agent_name: str, base_url: str | None = None) -> dict[str, str]:
+        """Register dynamic OAuth client (RFC 7591) with base_url, defaulting to the configured backend"""
+        base_url = base_url or self.base_url
         registration_data = {
             "client_name": f"HITL CLI - {agent_name}",
-            "redirect_uris": [self.redirect_uri],
-            "grant_types": ["authorization_code"],
-            "response_types": ["code"],
-            "token_endpoint_auth_method": "client_secret_post",
-            "scope": "openid profile email"
+            "redirect_uris": [self.REDIRECT_URI],
+            **_REGISTRATION_TEMPLATE
         }
 
-        typer.echo(f"📤 Sending registration request to: {self.base_url}/api/v1/oauth/register")
+        typer.echo(f"📤 Sending registration request to: {base_url}/api/v1/oauth/register")
         typer.echo(f"📋 Registration data: {json.dumps(registration_data, indent=2)}")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self.base_url}/api/v1/oauth/register",
-                json=registration_data,
-                headers={"Content-Type": "application/json"}
-            )
+        response = await _get_oauth_http().post(
+            f"{base_url}/api/v1/oauth/register",
+            json=registration_data,
+            headers={"Content-Type": "application/json"}
+        )
 
-            typer.echo(f"📥 Registration response status: {response.status_code}")
-            try:
-                hdrs = dict(response.headers)
-            except Exception:
-                hdrs = {}
-            typer.echo(f"📥 Registration response headers: {hdrs}")
-
-            if response.status_code != 201:
-                typer.echo(f"❌ Registration failed with status: {response.status_code}")
-                typer.echo(f"❌ Response body: {response.text}")
-                raise Exception(f"Client registration failed: {response.status_code} - {response.text}")
-
-            response_data = response.json()
-            typer.echo(f"✅ Registration successful! Response: {json.dumps(response_data, indent=2)}")
-
-            # Validate required fields in response
-            required_fields = ["client_id"]
-            for field in required_fields:
-                if field not in response_data:
-                    raise Exception(f"Missing required field '{field}' in registration response")
-
-            typer.echo(f"🔑 Generated client_id: {response_data['client_id']}")
-
-            # Handle both confidential and public clients
-            if "client_secret" in response_data:
-                typer.echo(f"🔒 Generated client_secret: {'*' * len(response_data.get('client_secret', ''))}")
-                typer.echo("📋 Registered as confidential client")
-            else:
-                typer.echo("📋 Registered as public client (no secret required)")
-
-            return response_data
-
-    def _start_callback_server(self, callback_data: dict) -> socketserver.TCPServer:
-        """Start local HTTP server for OAuth callback"""
+        typer.echo(f"📥 Registration response status: {response.status_code}")
+        try:
+            hdrs = dict(response.headers)
+        except Exception:
+            hdrs = {}
+        typer.echo(f"📥 Registration response headers: {hdrs}")
+
+        if response.status_code != 201:
+            typer.echo(f"❌ Registration failed with status: {response.status_code}")
+            typer.echo(f"❌ Response body: {response.text}")
+            raise Exception(f"Client registration failed: {response.status_code} - {response.text}")
+
+        response_data = response.json()
+        typer.echo(f"✅ Registration successful! Response: {json.dumps(response_data, indent=2)}")
+
+        # Validate required fields in response
+        required_fields = ["client_id"]
+        for field in required_fields:
+            if field not in response_data:
+                raise Exception(f"Missing required field '{field}' in registration response")
+
+        typer.echo(f"🔑 Generated client_id: {response_data['client_id']}")
+
+        # Handle both confidential and public clients
+        if "client_secret" in response_data:
+            typer.echo(f"🔒 Generated client_secret: {'*' * len(response_data.get('client_secret', ''))}")
+            typer.echo("📋 Registered as confidential client")
+        else:
+            typer.echo("📋 Registered as public client (no secret required)")
+
+        return response_data
+
+    async def register_clients(self, base_urls: list[str], agent_name: str) -> list[dict[str, str]]:
+        """Register dynamic OAuth clients with several backends concurrently, in base_urls order"""
+        return await asyncio.gather(*(self._register_client(agent_name, base_url) for base_url in base_urls))
+
+    def _start_callback_server(self, callback_data: dict, on_callback: Callable[[], None] | None = None) -> socketserver.TCPServer:
+        """Start local HTTP server for OAuth callback, calling on_callback once it is handled"""
         def handler(*args, **kwargs):
             return OAuthCallbackHandler(callback_data, *args, **kwargs)
 
-        server = socketserver.TCPServer(("localhost", self.callback_port), handler)
-        server_thread = threading.Thread(target=server.handle_request)
+        def serve_once():
+            server.handle_request()
+            if on_callback:
+                on_callback()
+
+        server = socketserver.TCPServer(("localhost", self.CALLBACK_PORT), handler)
+        server_thread = threading.Thread(target=serve_once)
         server_thread.daemon = True
         server_thread.start()
 
@@ -265,7 +309,7 @@ class OAuthDynamicClient:
         params = {
             "response_type": "code",
             "client_id": client_id,
-            "redirect_uri": self.redirect_uri,
+            "redirect_uri": self.REDIRECT_URI,
             "scope": "openid profile email",
             "state": state,
             "code_challenge": code_challenge,
@@ -276,7 +320,7 @@ class OAuthDynamicClient:
 
         typer.echo("🔗 Authorization URL parameters:")
         typer.echo(f"   - client_id: {client_id}")
-        typer.echo(f"   - redirect_uri: {self.redirect_uri}")
+        typer.echo(f"   - redirect_uri: {self.REDIRECT_URI}")
         typer.echo(f"   - state: {state}")
         typer.echo(f"   - code_challenge: {code_challenge[:20]}...")
         typer.echo(f"🌐 Full authorization URL: {authorization_url}")
@@ -295,7 +339,7 @@ class OAuthDynamicClient:
         token_data = {
             "grant_type": "authorization_code",
             "code": authorization_code,
-            "redirect_uri": self.redirect_uri,
+            "redirect_uri": self.REDIRECT_URI,
             "client_id": client_id,
             "code_verifier": code_verifier
         }
@@ -315,30 +359,29 @@ class OAuthDynamicClient:
         typer.echo(f"   - code: {authorization_code[:20]}...")
         typer.echo(f"   - agent_name: {agent_name}")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self.base_url}/api/v1/oauth/token",
-                data=token_data,
-                headers=headers
-            )
+        response = await _get_oauth_http().post(
+            f"{self.base_url}/api/v1/oauth/token",
+            data=token_data,
+            headers=headers
+        )
 
-            typer.echo(f"📥 Token exchange response status: {response.status_code}")
-            try:
-                hdrs = dict(response.headers)
-            except Exception:
-                hdrs = {}
-            typer.echo(f"📥 Token exchange response headers: {hdrs}")
+        typer.echo(f"📥 Token exchange response status: {response.status_code}")
+        try:
+            hdrs = dict(response.headers)
+        except Exception:
+            hdrs = {}
+        typer.echo(f"📥 Token exchange response headers: {hdrs}")
 
-            if response.status_code != 200:
-                typer.echo(f"❌ Token exchange failed with status: {response.status_code}")
-                typer.echo(f"❌ Response body: {response.text}")
-                raise Exception(f"Token exchange failed: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            typer.echo(f"❌ Token exchange failed with status: {response.status_code}")
+            typer.echo(f"❌ Response body: {response.text}")
+            raise Exception(f"Token exchange failed: {response.status_code} - {response.text}")
 
-            response_data = response.json()
-            typer.echo("✅ Token exchange successful!")
-            typer.echo(f"📋 Response keys: {list(response_data.keys())}")
+        response_data = response.json()
+        typer.echo("✅ Token exchange successful!")
+        typer.echo(f"📋 Response keys: {list(response_data.keys())}")
 
-            return response_data
+        return response_data
 
     async def perform_dynamic_oauth_flow(self, agent_name: str) -> tuple[str, str]:
         """Perform complete OAuth 2.1 dynamic registration and authorization flow"""
@@ -373,7 +416,12 @@ class OAuthDynamicClient:
 
         # Step 3: Start callback server
         callback_data = {}
-        server = self._start_callback_server(callback_data)
+        callback_received = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        server = self._start_callback_server(
+            callback_data,
+            on_callback=lambda: loop.call_soon_threadsafe(callback_received.set)
+        )
 
         try:
             # Step 4: Build authorization URL and open browser
@@ -391,12 +439,12 @@ class OAuthDynamicClient:
             # Step 5: Wait for callback
             typer.echo("⏳ Waiting for authorization callback...")
 
-            # Wait for callback with timeout
+            # Wait for callback with timeout, without blocking the event loop
             timeout = 900  # 15 minutes
-            start_time = time.time()
-
-            while not callback_data and (time.time() - start_time) < timeout:
-                time.sleep(0.5)
+            try:
+                await asyncio.wait_for(callback_received.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
 
             if not callback_data:
                 raise Exception("Authorization timeout - no callback received")
@@ -442,11 +490,7 @@ def save_oauth_client(client_data: dict[str, str]):
     """Save OAuth client registration data"""
     ensure_secure_storage()
 
-    with open(OAUTH_CLIENT_FILE, "w") as f:
-        json.dump(client_data, f)
-
-    # Set file permissions to 600 (owner read/write only)
-    os.chmod(OAUTH_CLIENT_FILE, stat.S_IRUSR | stat.S_IWUSR)
+    _write_secure_json(OAUTH_CLIENT_FILE, client_data)
 
 
 def load_oauth_client() -> dict[str, str] | None:
@@ -464,40 +508,59 @@ def load_oauth_client() -> dict[str, str] | None:
 def save_oauth_token(token_data: dict[str, str]):
     """Save OAuth token data"""
     ensure_secure_storage()
+    clear_oauth_token_cache()
 
-    with open(OAUTH_TOKEN_FILE, "w") as f:
-        json.dump(token_data, f)
-
-    # Set file permissions to 600 (owner read/write only)
-    os.chmod(OAUTH_TOKEN_FILE, stat.S_IRUSR | stat.S_IWUSR)
+    _write_secure_json(OAUTH_TOKEN_FILE, token_data)
 
 
 def load_oauth_token() -> dict[str, str] | None:
-    """Load OAuth token data"""
-    if not OAUTH_TOKEN_FILE.exists():
+    """Load OAuth token data, reusing the parsed file while it is unchanged on disk"""
+    global _oauth_token_cache
+
+    try:
+        file_stat = OAUTH_TOKEN_FILE.stat()
+    except FileNotFoundError:
         return None
 
+    # Token writers use os.replace, so a new inode catches rewrites that coarse mtimes miss
+    cache_key = (str(OAUTH_TOKEN_FILE), file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+    if _oauth_token_cache is not None and _oauth_token_cache[0] == cache_key:
+        return dict(_oauth_token_cache[1])
+
     try:
-        with open(OAUTH_TOKEN_FILE) as f:
-            return json.load(f)
+        token_data = json.loads(OAUTH_TOKEN_FILE.read_bytes())
     except (json.JSONDecodeError, FileNotFoundError):
         return None
 
+    _oauth_token_cache = (cache_key, token_data)
+    return dict(token_data)
+
+
+def clear_oauth_token_cache():
+    """Drop the in-process OAuth token cache"""
+    global _oauth_token_cache
+    _oauth_token_cache = None
+
 
 def delete_oauth_tokens():
     """Delete OAuth client and token files"""
+    clear_oauth_token_cache()
     if OAUTH_CLIENT_FILE.exists():
         OAUTH_CLIENT_FILE.unlink()
     if OAUTH_TOKEN_FILE.exists():
         OAUTH_TOKEN_FILE.unlink()
 
 
-def is_oauth_token_expired(token_data: dict[str, str]) -> bool:
-    """Check if OAuth token is expired"""
+def is_oauth_token_expired(token_data: dict[str, str], buffer_s: int = 300) -> bool:
+    """Check if OAuth token is expired or will expire within buffer_s seconds"""
     if not token_data.get('expires_at'):
         return True  # Treat as expired if no expiry info
 
-    return int(time.time()) >= int(token_data['expires_at'])
+    # Refresh early so a token cannot expire mid-request, but never for more than
+    # half its lifetime, or short-lived tokens would always look expired
+    if token_data.get('expires_in'):
+        buffer_s = min(buffer_s, int(token_data['expires_in']) // 2)
+    return int(time.time()) + buffer_s >= int(token_data['expires_at'])
 
 
 async def refresh_oauth_token(refresh_token: str, client_id: str, client_secret: str | None = None) -> dict[str, str]:
@@ -512,23 +575,22 @@ async def refresh_oauth_token(refresh_token: str, client_id: str, client_secret:
     if client_secret:
         token_data["client_secret"] = client_secret
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{BACKEND_BASE_URL}/api/v1/oauth/token",
-            data=token_data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
-        )
+    response = await _get_oauth_http().post(
+        f"{BACKEND_BASE_URL}/api/v1/oauth/token",
+        data=token_data,
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
 
-        if response.status_code != 200:
-            raise Exception(f"Token refresh failed: {response.status_code} - {response.text}")
+    if response.status_code != 200:
+        raise Exception(f"Token refresh failed: {response.status_code} - {response.text}")
 
-        token_response = response.json()
+    token_response = response.json()
 
-        # Add expiry timestamp
-        if 'expires_in' in token_response:
-            token_response['expires_at'] = int(time.time()) + int(token_response['expires_in'])
+    # Add expiry timestamp
+    if 'expires_in' in token_response:
+        token_response['expires_at'] = int(time.time()) + int(token_response['expires_in'])
 
-        return token_response
+    return token_response
 
 
 def is_using_oauth() -> bool:
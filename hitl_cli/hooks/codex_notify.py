@@ -10,9 +10,16 @@ Configuration in ~/.codex/config.toml:
 
 or with full path:
     notify = ["python3", "/path/to/codex_notify.py"]
+
+The notification is sent in-process. Set HITL_CODEX_NOTIFY_SUBPROCESS=1 to
+shell out to `hitl-cli notify` instead.
 """
 
+import asyncio
+import contextlib
+import io
 import json
+import os
 import subprocess
 import sys
 
@@ -63,6 +70,38 @@ def format_notification_message(notification: dict) -> str:
         return f"Codex notification ({notification_type}): {json.dumps(notification)}"
 
 
+async def _do_notify(message: str) -> str:
+    """Send the notification through the HITL SDK in this process."""
+    from hitl_cli.sdk import HITL
+
+    return await HITL().notify(message)
+
+
+def _notify_in_process(message: str) -> int:
+    """
+    Send the notification in-process, keeping SDK console output off Codex's stdout.
+
+    Returns:
+        0 on success, 1 on error
+    """
+    import httpx
+    import typer
+
+    captured = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(captured):
+            asyncio.run(_do_notify(message))
+    except typer.Exit as e:
+        # The reason was echoed to the captured stdout before the exit was raised
+        reason = captured.getvalue().strip() or f"exit code {e.exit_code}"
+        print(f"Error: Failed to send HITL notification: {reason}", file=sys.stderr)
+        return 1
+    except httpx.HTTPError as e:
+        print(f"Error: Failed to send HITL notification: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
 def main() -> int:
     """
     Main entry point for the Codex notify hook.
@@ -88,19 +127,23 @@ def main() -> int:
         # Format notification message
         message = format_notification_message(notification)
 
-        # Send notification via HITL CLI
-        subprocess.run(
-            ["hitl-cli", "notify", "--message", message],
-            check=True,
-            capture_output=True,
-            text=True
-        )
+        # Send notification, avoiding a second interpreter start unless asked for
+        if not os.environ.get("HITL_CODEX_NOTIFY_SUBPROCESS"):
+            return _notify_in_process(message)
+
+        try:
+            subprocess.run(
+                ["hitl-cli", "notify", "--message", message],
+                check=True,
+                capture_output=True,
+                text=True
+            )
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"Error: Failed to send HITL notification: {e}", file=sys.stderr)
+            return 1
 
         return 0
 
-    except subprocess.CalledProcessError as e:
-        print(f"Error: Failed to send HITL notification: {e}", file=sys.stderr)
-        return 1
     except Exception as e:
         print(f"Error: Unexpected error in codex notify hook: {e}", file=sys.stderr)
         return 1
@@ -6,17 +6,86 @@ This hook intercepts Claude's stop events, extracts the last assistant message,
 and sends it to a human for review via the HITL notification system.
 """
 import json
+import os
 import subprocess
 import sys
 import time
 
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_lines_reversed(path: str, chunk_size: int = _READ_CHUNK_SIZE):
+    """Yield the raw lines of a file from last to first, reading it backwards in chunks."""
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        # Pieces of the line being assembled, last piece first; joined once the line is complete
+        pending = []
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size)
+            lines = chunk.split(b"\n")
+            if len(lines) == 1:
+                pending.append(chunk)
+                continue
+            # The last piece completes the pending line; the first may continue in an earlier chunk
+            pending.append(lines[-1])
+            yield b"".join(reversed(pending))
+            yield from reversed(lines[1:-1])
+            pending = [lines[0]]
+        yield b"".join(reversed(pending))
+
+
+def _extract_assistant_text(line: bytes) -> str | None:
+    """Return the joined text blocks of an assistant transcript entry, or None."""
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+    if not isinstance(entry, dict):
+        return None
+
+    # Get the message object
+    message = entry.get("message", {})
+    if not isinstance(message, dict):
+        return None
+
+    # Check if this is an assistant message (handle both formats)
+    is_assistant = (
+        entry.get("type") == "assistant" or
+        message.get("role") == "assistant"
+    )
+
+    if not is_assistant:
+        return None
+
+    # Extract text content from the message
+    content = message.get("content", [])
+    if not isinstance(content, list):
+        return None
+
+    # Collect all text blocks (skip thinking, tool_use, etc.)
+    text_parts = []
+    for item in content:
+        if isinstance(item, dict) and item.get("type") == "text":
+            text = item.get("text")
+            if text and isinstance(text, str) and text.strip():
+                text_parts.append(text)
+        elif isinstance(item, str) and item.strip():
+            text_parts.append(item)
+
+    return "".join(text_parts).strip() if text_parts else None
+
 
 def get_last_assistant_message(transcript_path: str, retries: int = 3, delay: float = 0.2) -> str:
     """
     Reads a JSONL transcript file and returns the last assistant message with text content.
 
-    Iterates from the END of the file backwards to find the most recent assistant
-    message that contains actual text (not just thinking or tool_use blocks).
+    Reads the file backwards from the END to find the most recent assistant
+    message that contains actual text (not just thinking or tool_use blocks),
+    so only the tail of a long transcript is read and parsed.
 
     Note: There's a known race condition where the Stop hook can fire before the
     transcript is fully written. We retry with a small delay to handle this.
@@ -35,59 +104,17 @@ def get_last_assistant_message(transcript_path: str, retries: int = 3, delay: fl
             time.sleep(delay)
 
         try:
-            with open(transcript_path) as f:
-                lines = f.readlines()
+            for line in _iter_lines_reversed(transcript_path):
+                if not line.strip():
+                    continue
+                text = _extract_assistant_text(line)
+                if text:
+                    return text
         except FileNotFoundError:
             return "Error: Transcript file not found."
         except Exception as e:
             return f"Error reading transcript: {e}"
 
-        if not lines:
-            continue  # Retry if empty
-
-        # Iterate from the END of the file to find the most recent assistant message with text
-        for line in reversed(lines):
-            try:
-                entry = json.loads(line.strip())
-            except json.JSONDecodeError:
-                continue
-
-            if not isinstance(entry, dict):
-                continue
-
-            # Get the message object
-            message = entry.get("message", {})
-            if not isinstance(message, dict):
-                continue
-
-            # Check if this is an assistant message (handle both formats)
-            is_assistant = (
-                entry.get("type") == "assistant" or
-                message.get("role") == "assistant"
-            )
-
-            if not is_assistant:
-                continue
-
-            # Extract text content from the message
-            content = message.get("content", [])
-            if not isinstance(content, list):
-                continue
-
-            # Collect all text blocks (skip thinking, tool_use, etc.)
-            text_parts = []
-            for item in content:
-                if isinstance(item, dict) and item.get("type") == "text":
-                    text = item.get("text")
-                    if text and isinstance(text, str) and text.strip():
-                        text_parts.append(text)
-                elif isinstance(item, str) and item.strip():
-                    text_parts.append(item)
-
-            # If we found text, return it
-            if text_parts:
-                return "".join(text_parts).strip()
-
     return "No recent assistant message found in transcript."
 
 
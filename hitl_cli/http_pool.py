@@ -0,0 +1,59 @@
+"""Shared httpx clients scoped to the event loop that uses them."""
+
+import asyncio
+import threading
+import weakref
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import httpx
+
+
+async def _close_on_loop_shutdown(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """Suspend until the loop finalizes its async generators on shutdown, then close the client"""
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def _start_closer(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """Register a closer for client with the running loop's async generator hooks"""
+    closer = _close_on_loop_shutdown(client)
+    # Advancing to the first yield runs no I/O; it only makes the loop track the generator
+    try:
+        closer.asend(None).send(None)
+    except StopIteration:
+        pass
+    return closer
+
+
+class LoopBoundClient:
+    """An httpx.AsyncClient reused within one event loop and closed when that loop shuts down"""
+
+    def __init__(self, **client_kwargs: Any):
+        self._client_kwargs = client_kwargs
+        # The loop only tracks closers weakly, so each one is held here next to its client
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, AsyncGenerator[None, None]]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> httpx.AsyncClient:
+        """Get the client for the running event loop, creating one if needed"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._clients.get(loop)
+            if entry is not None and not entry[0].is_closed:
+                return entry[0]
+
+            # Forget loops closed without finalizing their async generators
+            for stale_loop in [other for other in self._clients if other.is_closed()]:
+                del self._clients[stale_loop]
+
+            # Keep-alive connections cannot outlive their loop (each asyncio.run() gets a new one).
+            # asyncio.run(), asyncio.Runner and loop.shutdown_asyncgens() all finalize the
+            # closer, shutting the pooled sockets while their loop can still tear them down
+            client = httpx.AsyncClient(**self._client_kwargs)
+            self._clients[loop] = (client, _start_closer(client))
+        return client
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 import httpx
@@ -18,6 +19,9 @@ from .auth import (
 )
 from .config import BACKEND_BASE_URL
 
+# In-flight token refreshes keyed by refresh token, so concurrent callers share one request
+_inflight_refreshes: dict[str, asyncio.Task] = {}
+
 
 class MCPClient:
     """Client for making MCP calls using FastMCP streamable HTTP transport"""
@@ -70,21 +74,19 @@ class MCPClient:
             if not client_data:
                 raise Exception("OAuth client data not found - please login again")
 
-            try:
-                # Refresh the token
-                new_token_data = await refresh_oauth_token(
-                    refresh_token,
-                    client_data['client_id'],
-                    client_data.get('client_secret')
+            # Join a refresh already in flight on this loop rather than starting another
+            task = _inflight_refreshes.get(refresh_token)
+            if task is None or task.get_loop() is not asyncio.get_running_loop():
+                task = asyncio.create_task(self._refresh_and_save_token(refresh_token, client_data))
+                _inflight_refreshes[refresh_token] = task
+                task.add_done_callback(
+                    lambda done: _inflight_refreshes.pop(refresh_token, None)
+                    if _inflight_refreshes.get(refresh_token) is done else None
                 )
 
-                # Preserve refresh token if not provided in response
-                if 'refresh_token' not in new_token_data:
-                    new_token_data['refresh_token'] = refresh_token
-
-                # Save updated token
-                save_oauth_token(new_token_data)
-
+            try:
+                # Shield so one cancelled caller does not cancel the refresh for the others
+                new_token_data = await asyncio.shield(task)
                 return new_token_data['access_token']
 
             except Exception as e:
@@ -92,6 +94,23 @@ class MCPClient:
 
         return token_data['access_token']
 
+    async def _refresh_and_save_token(self, refresh_token: str, client_data: dict[str, str]) -> dict[str, str]:
+        """Refresh the OAuth token and persist the result"""
+        new_token_data = await refresh_oauth_token(
+            refresh_token,
+            client_data['client_id'],
+            client_data.get('client_secret')
+        )
+
+        # Preserve refresh token if not provided in response
+        if 'refresh_token' not in new_token_data:
+            new_token_data['refresh_token'] = refresh_token
+
+        # Save updated token
+        save_oauth_token(new_token_data)
+
+        return new_token_data
+
     async def call_tool(self, tool_name: str, arguments: dict[str, Any], agent_id: str | None = None) -> str:
         """Make an MCP tool call using FastMCP Client with streamable HTTP transport"""
 
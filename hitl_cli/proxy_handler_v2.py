@@ -9,6 +9,7 @@ FastMCP server architecture.
 """
 
 import base64
+import functools
 import json
 import logging
 from typing import Any
@@ -20,9 +21,21 @@ from nacl.public import Box, PrivateKey, PublicKey
 
 from .auth import get_current_oauth_token, is_using_oauth
 from .crypto import load_agent_keypair
+from .http_pool import LoopBoundClient
 
 logger = logging.getLogger(__name__)
 
+# Backend tools the proxy implements itself with transparent E2EE
+E2EE_PROXIED_TOOLS = frozenset({"request_human_input", "notify_human"})
+
+# Shared HTTP client for backend REST calls, one per event loop
+_backend_http = LoopBoundClient(timeout=30.0)
+
+
+def _get_backend_http() -> httpx.AsyncClient:
+    """Get the shared backend HTTP client for the running event loop"""
+    return _backend_http.get()
+
 
 class BackendMCPClient:
     """
@@ -162,17 +175,27 @@ async def get_device_public_keys() -> list[str]:
     # Extract backend URL from global configuration
     from .config import BACKEND_BASE_URL
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(
-            f"{BACKEND_BASE_URL}/api/v1/devices/public-keys",
-            headers=headers
-        )
+    response = await _get_backend_http().get(
+        f"{BACKEND_BASE_URL}/api/v1/devices/public-keys",
+        headers=headers
+    )
 
-        if response.status_code != 200:
-            raise Exception(f"Failed to get device public keys: {response.status_code} - {response.text}")
+    if response.status_code != 200:
+        raise Exception(f"Failed to get device public keys: {response.status_code} - {response.text}")
 
-        result = response.json()
-        return result.get("public_keys", [])
+    result = response.json()
+    return result.get("public_keys", [])
+
+
+@functools.lru_cache(maxsize=64)
+def _get_box(agent_private_key: PrivateKey, device_public_key: str) -> Box:
+    """
+    Get the encryption box for an agent/device key pair.
+    
+    Box construction derives the Curve25519 shared key, so boxes are cached
+    and reused for every message exchanged with the same device.
+    """
+    return Box(agent_private_key, PublicKey(device_public_key, encoder=Base64Encoder))
 
 
 def encrypt_arguments(arguments: dict[str, Any], device_public_keys: list[str], agent_private_key: PrivateKey) -> str:
@@ -199,10 +222,9 @@ def encrypt_arguments(arguments: dict[str, Any], device_public_keys: list[str],
 
     # For simplicity, encrypt for first device key
     # In production, would implement multi-recipient encryption
-    device_public_key = PublicKey(device_public_keys[0], encoder=Base64Encoder)
 
-    # Create encryption box (agent -> device)
-    box = Box(agent_private_key, device_public_key)
+    # Get encryption box (agent -> device)
+    box = _get_box(agent_private_key, device_public_keys[0])
 
     # Encrypt the arguments
     encrypted_bytes = box.encrypt(arguments_bytes)
@@ -230,7 +252,7 @@ def decrypt_response(encrypted_data: str, device_public_key: str, agent_private_
         # Handle response format from MCP tool
         if isinstance(encrypted_data, dict) and 'result' in encrypted_data:
             content = encrypted_data['result'].get('content', [])
-            if content and len(content) > 0 and content[0].get('type') == 'text':
+            if content and content[0].get('type') == 'text':
                 encrypted_text = content[0]['text']
             else:
                 raise Exception("Invalid encrypted response format")
@@ -242,11 +264,8 @@ def decrypt_response(encrypted_data: str, device_public_key: str, agent_private_
         # Decode base64
         encrypted_bytes = base64.b64decode(encrypted_text)
 
-        # Get device public key
-        device_pub_key = PublicKey(device_public_key, encoder=Base64Encoder)
-
-        # Create decryption box (device -> agent)
-        box = Box(agent_private_key, device_pub_key)
+        # Get decryption box (device -> agent)
+        box = _get_box(agent_private_key, device_public_key)
 
         # Decrypt
         decrypted_bytes = box.decrypt(encrypted_bytes)
@@ -377,9 +396,6 @@ def create_fastmcp_proxy_server(backend_url: str) -> FastMCP:
             # Get tools from backend
             all_backend_tools = await backend_client.list_tools()
 
-            # Filter out E2EE variants and tools already implemented
-            implemented_tools = {"request_human_input", "notify_human"}
-
             for tool in all_backend_tools:
                 tool_name = tool["name"]
 
@@ -388,7 +404,7 @@ def create_fastmcp_proxy_server(backend_url: str) -> FastMCP:
                     continue
 
                 # Skip tools we've already implemented with E2EE
-                if tool_name in implemented_tools:
+                if tool_name in E2EE_PROXIED_TOOLS:
                     continue
 
                 # For other tools, create pass-through implementations
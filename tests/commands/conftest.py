@@ -0,0 +1,12 @@
+"""
+Shared fixtures for the CLI command tests.
+"""
+
+import pytest
+from typer.testing import CliRunner
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """Create a CLI runner shared by the tests in each module"""
+    return CliRunner()
@@ -7,34 +7,38 @@ These tests validate the CLI command behavior and user interactions.
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
-from hitl_cli.auth import save_token
+from hitl_cli.auth import delete_oauth_tokens, delete_token, is_logged_in, save_token
 from hitl_cli.main import app
-from typer.testing import CliRunner
 
 
-class TestLoginCommand:
-    """Test the login CLI command"""
+@pytest.fixture
+def mock_config_dir(tmp_path):
+    """Create a temporary config directory"""
+    config_dir = tmp_path / ".config" / "hitl-cli"
+    config_dir.mkdir(parents=True)
 
-    @pytest.fixture
-    def runner(self):
-        """Create a CLI runner for testing"""
-        return CliRunner()
+    # Patch the config module to use temp directory
+    with patch('hitl_cli.auth.CONFIG_DIR', config_dir), \
+         patch('hitl_cli.auth.TOKEN_FILE', config_dir / "token.json"), \
+         patch('hitl_cli.auth.OAUTH_TOKEN_FILE', config_dir / "oauth_token.json"), \
+         patch('hitl_cli.auth.OAUTH_CLIENT_FILE', config_dir / "oauth_client.json"):
+        delete_token()
+        delete_oauth_tokens()
+        yield config_dir
 
-    @pytest.fixture
-    def mock_config_dir(self, tmp_path):
-        """Create a temporary config directory"""
-        config_dir = tmp_path / ".config" / "hitl-cli"
-        config_dir.mkdir(parents=True)
 
-        # Patch the config module to use temp directory
-        with patch('hitl_cli.auth.CONFIG_DIR', config_dir), \
-             patch('hitl_cli.auth.TOKEN_FILE', config_dir / "token.json"), \
-             patch('hitl_cli.auth.OAUTH_TOKEN_FILE', config_dir / "oauth_token.json"):
-            from hitl_cli.auth import delete_oauth_tokens, delete_token
-            delete_token()
-            delete_oauth_tokens()
-            yield config_dir
+@pytest.fixture
+def mock_auth(mock_config_dir, monkeypatch):
+    """Mock a logged-in JWT user with fully isolated auth files"""
+    # Ensure HITL_API_KEY is not set so tests use the JWT/MCP auth path
+    monkeypatch.delenv('HITL_API_KEY', raising=False)
+
+    save_token("test-jwt-token")
+    return mock_config_dir
+
 
+class TestLoginCommand:
+    """Test the login CLI command"""
 
     def test_login_flow_success(self, runner, mock_config_dir):
         """Test successful login flow"""
@@ -61,73 +65,40 @@ class TestLoginCommand:
         """Test login when already logged in"""
 
         # Save a token first
-        with patch('hitl_cli.auth.CONFIG_DIR', mock_config_dir):
-            with patch('hitl_cli.auth.TOKEN_FILE', mock_config_dir / "token.json"):
-                save_token("existing-token")
+        save_token("existing-token")
 
-                result = runner.invoke(app, ["login"])
+        result = runner.invoke(app, ["login"])
 
-                assert result.exit_code == 0
-                assert "Already logged in!" in result.output
+        assert result.exit_code == 0
+        assert "Already logged in!" in result.output
 
 
 class TestLogoutCommand:
     """Test the logout CLI command"""
 
-    @pytest.fixture
-    def runner(self):
-        return CliRunner()
-
-    def test_logout_flow(self, runner, tmp_path):
+    def test_logout_flow(self, runner, mock_config_dir):
         """Test logout flow"""
-        config_dir = tmp_path / ".config" / "hitl-cli"
-        config_dir.mkdir(parents=True)
-
         # Save a token first
-        with patch('hitl_cli.auth.CONFIG_DIR', config_dir):
-            with patch('hitl_cli.auth.TOKEN_FILE', config_dir / "token.json"):
-                save_token("test-token")
+        save_token("test-token")
+        assert is_logged_in()
 
-                result = runner.invoke(app, ["logout"])
+        result = runner.invoke(app, ["logout"])
 
-                assert result.exit_code == 0
-                assert "Logged out successfully!" in result.output
+        assert result.exit_code == 0
+        assert "Logged out successfully!" in result.output
+        assert not is_logged_in()
 
-    def test_logout_not_logged_in(self, runner, tmp_path):
+    def test_logout_not_logged_in(self, runner, mock_config_dir):
         """Test logout when not logged in"""
-        config_dir = tmp_path / ".config" / "hitl-cli"
-        config_dir.mkdir(parents=True)
-
-        with patch('hitl_cli.auth.CONFIG_DIR', config_dir):
-            with patch('hitl_cli.auth.TOKEN_FILE', config_dir / "token.json"):
-                result = runner.invoke(app, ["logout"])
+        result = runner.invoke(app, ["logout"])
 
-                assert result.exit_code == 0
-                assert "Not logged in." in result.output
+        assert result.exit_code == 0
+        assert "Not logged in." in result.output
 
 
 class TestAgentCommands:
     """Test agent management CLI commands"""
 
-    @pytest.fixture
-    def runner(self):
-        return CliRunner()
-
-    @pytest.fixture
-    def mock_auth(self, tmp_path, monkeypatch):
-        """Mock authentication state"""
-        # Ensure HITL_API_KEY is not set so tests use JWT auth path
-        monkeypatch.delenv('HITL_API_KEY', raising=False)
-
-        config_dir = tmp_path / ".config" / "hitl-cli"
-        config_dir.mkdir(parents=True)
-        token_file = config_dir / "token.json"
-
-        with patch('hitl_cli.auth.CONFIG_DIR', config_dir), \
-             patch('hitl_cli.auth.TOKEN_FILE', token_file):
-            save_token("test-jwt-token")
-            yield
-
     def test_agents_list_success(self, runner, mock_auth):
         """Test listing agents"""
 
@@ -184,90 +155,46 @@ class TestRequestCommand:
     """Test the request CLI command"""
 
     @pytest.fixture
-    def runner(self):
-        return CliRunner()
-
-    @pytest.fixture
-    def mock_auth(self, tmp_path, monkeypatch):
-        """Mock authentication state"""
-        # Ensure HITL_API_KEY is not set so tests use JWT/MCP auth path
-        monkeypatch.delenv('HITL_API_KEY', raising=False)
-
-        config_dir = tmp_path / ".config" / "hitl-cli"
-        config_dir.mkdir(parents=True)
-        token_file = config_dir / "token.json"
-
-        with patch('hitl_cli.auth.CONFIG_DIR', config_dir), \
-             patch('hitl_cli.auth.TOKEN_FILE', token_file):
-            save_token("test-jwt-token")
-            yield
-
-    def test_request_with_new_agent(self, runner, mock_auth):
-        """Test making a request that creates a new agent"""
-
-        with patch('hitl_cli.mcp_client.MCPClient.request_human_input', new_callable=AsyncMock) as mock_request_human_input:
-            mock_request_human_input.return_value = "User approved"
-
-            with patch('hitl_cli.auth.get_current_agent_id', return_value=None):
-                result = runner.invoke(app, ["request", "--prompt", "Approve deployment?"])
-
-                assert result.exit_code == 0
-                assert "Sending request: Approve deployment?" in result.output
-                assert "Waiting for human response..." in result.output
-                assert "Human response received: User approved" in result.output
-
-                mock_request_human_input.assert_awaited_once_with(
-                    prompt='Approve deployment?',
-                    choices=None,
-                    placeholder_text=None,
-                    agent_id=None
-                )
-
-    def test_request_with_existing_agent(self, runner, mock_auth):
-        """Test making a request with an existing agent ID"""
-
-        with patch('hitl_cli.mcp_client.MCPClient.request_human_input', new_callable=AsyncMock) as mock_request_human_input:
-            mock_request_human_input.return_value = "User denied"
-
-            with patch('hitl_cli.auth.get_current_agent_id', return_value="existing-agent-id"):
-                result = runner.invoke(app, [
-                    "request",
-                    "--prompt", "Approve deployment?",
-                    "--agent-id", "existing-agent-id"
-                ])
-
-                assert result.exit_code == 0
-                assert "Human response received: User denied" in result.output
-
-                mock_request_human_input.assert_awaited_once_with(
-                    prompt='Approve deployment?',
-                    choices=None,
-                    placeholder_text=None,
-                    agent_id='existing-agent-id'
-                )
-
-    def test_request_with_choices(self, runner, mock_auth):
-        """Test making a request with multiple choice options"""
-
-        with patch('hitl_cli.mcp_client.MCPClient.request_human_input', new_callable=AsyncMock) as mock_request_human_input:
-            mock_request_human_input.return_value = "Yes"
-
-            with patch('hitl_cli.auth.get_current_agent_id', return_value=None):
-                result = runner.invoke(app, [
-                    "request",
-                    "--prompt", "Continue with operation?",
-                    "--choice", "Yes",
-                    "--choice", "No",
-                    "--choice", "Maybe"
-                ])
-
-                assert result.exit_code == 0
-                assert "Choices: ['Yes', 'No', 'Maybe']" in result.output
-                assert "Human response received: Yes" in result.output
-
-                mock_request_human_input.assert_awaited_once_with(
-                    prompt='Continue with operation?',
-                    choices=['Yes', 'No', 'Maybe'],
-                    placeholder_text=None,
-                    agent_id=None
-                )
+    def mock_request_human_input(self, mock_auth):
+        """Patch the MCP request call made by the request command"""
+        with patch('hitl_cli.mcp_client.MCPClient.request_human_input', new_callable=AsyncMock) as mock_request:
+            yield mock_request
+
+    @pytest.mark.parametrize("cli_args, agent_id, response, choices, expected_output", [
+        pytest.param(
+            ["--prompt", "Approve deployment?"],
+            None, "User approved", None,
+            ["Sending request: Approve deployment?", "Waiting for human response...",
+             "Human response received: User approved"],
+            id="new-agent",
+        ),
+        pytest.param(
+            ["--prompt", "Approve deployment?", "--agent-id", "existing-agent-id"],
+            "existing-agent-id", "User denied", None,
+            ["Human response received: User denied"],
+            id="existing-agent",
+        ),
+        pytest.param(
+            ["--prompt", "Continue with operation?", "--choice", "Yes", "--choice", "No", "--choice", "Maybe"],
+            None, "Yes", ['Yes', 'No', 'Maybe'],
+            ["Choices: ['Yes', 'No', 'Maybe']", "Human response received: Yes"],
+            id="choices",
+        ),
+    ])
+    def test_request(self, runner, mock_request_human_input, cli_args, agent_id, response, choices, expected_output):
+        """Test making a request with a new agent, an existing agent ID, or multiple choice options"""
+        mock_request_human_input.return_value = response
+
+        with patch('hitl_cli.auth.get_current_agent_id', return_value=agent_id):
+            result = runner.invoke(app, ["request", *cli_args])
+
+        assert result.exit_code == 0
+        for expected in expected_output:
+            assert expected in result.output
+
+        mock_request_human_input.assert_awaited_once_with(
+            prompt=cli_args[1],
+            choices=choices,
+            placeholder_text=None,
+            agent_id=agent_id
+        )
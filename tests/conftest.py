@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the hitl-cli test suite.
+"""
+
+import httpx
+import pytest
+
+
+class HTTPRouter:
+    """Route mocked HTTP requests by method and path, recording each request"""
+
+    def __init__(self):
+        self.routes = {}
+        self.calls = []
+
+    def add(self, method, path, status_code, json_body):
+        self.routes[(method, path)] = (status_code, json_body)
+
+    def __call__(self, request):
+        self.calls.append(request)
+        route = self.routes.get((request.method, request.url.path))
+        if route is None:
+            return httpx.Response(404, json={"error": "not_found"})
+        status_code, json_body = route
+        return httpx.Response(status_code, json=json_body)
+
+
+@pytest.fixture
+async def mock_http():
+    """An HTTP client over an in-memory router, closed on teardown; yields (client, router)"""
+    router = HTTPRouter()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(router)) as client:
+        yield client, router
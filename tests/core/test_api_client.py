@@ -9,6 +9,7 @@ These tests validate:
 """
 
 import json
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import pytest
@@ -17,6 +18,10 @@ from hitl_cli.api_client import ApiClient
 from hitl_cli.auth import save_token
 
 
+def _raise_invalid_json():
+    raise json.JSONDecodeError("Invalid JSON", "", 0)
+
+
 class TestApiClientExitCodeHandling:
     """Test API Client exit code handling"""
 
@@ -42,9 +47,7 @@ class TestApiClientExitCodeHandling:
         client = ApiClient()
 
         # Mock 401 response
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.json.return_value = {"detail": "Authentication failed"}
+        mock_response = SimpleNamespace(status_code=401, json=lambda: {"detail": "Authentication failed"}, text="")
 
         with pytest.raises(typer.Exit) as exc_info:
             client._handle_response(mock_response)
@@ -61,9 +64,7 @@ class TestApiClientExitCodeHandling:
         client = ApiClient()
 
         # Mock 500 response
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.json.return_value = {"detail": "Internal server error"}
+        mock_response = SimpleNamespace(status_code=500, json=lambda: {"detail": "Internal server error"}, text="")
 
         with pytest.raises(typer.Exit) as exc_info:
             client._handle_response(mock_response)
@@ -80,9 +81,7 @@ class TestApiClientExitCodeHandling:
         client = ApiClient()
 
         # Mock successful response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"status": "success", "data": "test"}
+        mock_response = SimpleNamespace(status_code=200, json=lambda: {"status": "success", "data": "test"}, text="")
 
         result = client._handle_response(mock_response)
 
@@ -96,9 +95,7 @@ class TestApiClientExitCodeHandling:
         client = ApiClient()
 
         # Mock response with invalid JSON
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
+        mock_response = SimpleNamespace(status_code=200, json=_raise_invalid_json, text="")
 
         result = client._handle_response(mock_response)
 
@@ -143,11 +140,10 @@ class TestApiClientSyncWrapperHandling:
 
         client = ApiClient()
 
-        with patch('httpx.AsyncClient') as mock_client_class:
+        with patch('hitl_cli.api_client._get_api_http') as mock_get_http:
             from unittest.mock import AsyncMock
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-            mock_client_class.return_value.__aexit__.return_value = None
+            mock_get_http.return_value = mock_client
 
             # Mock 401 response to trigger typer.Exit
             mock_response = Mock()
@@ -172,10 +168,10 @@ class TestApiClientSyncWrapperHandling:
 
         client = ApiClient()
 
-        with patch('httpx.AsyncClient') as mock_client_class:
+        with patch('hitl_cli.api_client._get_api_http') as mock_get_http:
             from unittest.mock import AsyncMock
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_http.return_value = mock_client
 
             # Mock successful response
             mock_response = Mock()
@@ -223,6 +219,33 @@ class TestApiClientAuthentication:
         assert headers["Authorization"] == "Bearer test-jwt-token"
         assert headers["Content-Type"] == "application/json"
 
+    def test_get_headers_cached_until_invalidated(self, mock_config_dir):
+        """Test that headers are built once per client and rebuilt after invalidate_headers"""
+        client = ApiClient()
+
+        with patch('hitl_cli.api_client.get_current_token', return_value="test-jwt-token") as mock_token:
+            assert client._get_headers() is client._get_headers()
+            assert mock_token.call_count == 1
+
+            mock_token.return_value = "refreshed-jwt-token"
+            client.invalidate_headers()
+
+            assert client._get_headers()["Authorization"] == "Bearer refreshed-jwt-token"
+            assert mock_token.call_count == 2
+
+    def test_unauthorized_response_drops_cached_headers(self, mock_config_dir):
+        """Test that a 401 makes the next request re-read the (possibly refreshed) token"""
+        client = ApiClient()
+
+        with patch('hitl_cli.api_client.get_current_token', return_value="stale-jwt-token") as mock_token:
+            client._get_headers()
+
+            with pytest.raises(typer.Exit):
+                client._handle_response(SimpleNamespace(status_code=401, json=dict, text=""))
+
+            mock_token.return_value = "refreshed-jwt-token"
+            assert client._get_headers()["Authorization"] == "Bearer refreshed-jwt-token"
+
     def test_all_methods_use_auth_headers(self, mock_config_dir):
         """Test that all HTTP methods use authentication headers"""
         config_dir, token_file = mock_config_dir
@@ -230,10 +253,10 @@ class TestApiClientAuthentication:
 
         client = ApiClient()
 
-        with patch('httpx.AsyncClient') as mock_client_class:
+        with patch('hitl_cli.api_client._get_api_http') as mock_get_http:
             from unittest.mock import AsyncMock
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_http.return_value = mock_client
 
             # Mock successful response
             mock_response = Mock()
@@ -4,6 +4,7 @@ Tests for core authentication logic
 These tests validate the authentication helper functions and token management.
 """
 
+import stat
 from unittest.mock import patch
 
 from hitl_cli.auth import is_logged_in, load_token, save_token
@@ -70,10 +71,10 @@ class TestTokenSecurity:
                 save_token("test-token")
 
                 # Check directory permissions (700)
-                assert oct(config_dir.stat().st_mode)[-3:] == '700'
+                assert stat.S_IMODE(config_dir.stat().st_mode) == 0o700
 
                 # Check file permissions (600)
-                assert oct(token_file.stat().st_mode)[-3:] == '600'
+                assert stat.S_IMODE(token_file.stat().st_mode) == 0o600
 
                 # Verify token content
                 assert load_token() == "test-token"
@@ -93,4 +94,23 @@ class TestTokenSecurity:
 
                 # Directory should now exist with correct permissions
                 assert config_dir.exists()
-                assert oct(config_dir.stat().st_mode)[-3:] == '700'
+                assert stat.S_IMODE(config_dir.stat().st_mode) == 0o700
+
+    def test_token_write_ignores_stale_temp_file(self, tmp_path):
+        """Test a world-readable temp file left by a crashed write is not reused"""
+        config_dir = tmp_path / ".config" / "hitl-cli"
+        config_dir.mkdir(parents=True)
+        token_file = config_dir / "token.json"
+        stale_tmp = config_dir / "token.json.tmp"
+        stale_tmp.write_text("stale")
+        stale_tmp.chmod(0o644)
+
+        with patch('hitl_cli.auth.CONFIG_DIR', config_dir), \
+             patch('hitl_cli.auth.TOKEN_FILE', token_file):
+            save_token("test-token")
+
+            assert stat.S_IMODE(token_file.stat().st_mode) == 0o600
+            assert load_token() == "test-token"
+            # The stale file is left untouched and no new temp file is left behind
+            assert stale_tmp.read_text() == "stale"
+            assert sorted(p.name for p in config_dir.iterdir()) == ["token.json", "token.json.tmp"]
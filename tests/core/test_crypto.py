@@ -5,13 +5,11 @@ Tests agent keypair generation, storage, and retrieval for end-to-end encryption
 Uses PyNaCl for cryptographic operations.
 """
 
-import tempfile
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+import stat
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 import pytest
-
-pytest.importorskip("nacl")
 from hitl_cli.crypto import (
     ensure_agent_keypair,
     generate_agent_keypair,
@@ -24,11 +22,37 @@ from nacl.encoding import Base64Encoder
 from nacl.public import PrivateKey, PublicKey
 
 
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path, monkeypatch):
+    """Keep any unpatched key lookup away from the real home directory."""
+    home = tmp_path / "home"
+    monkeypatch.setattr('hitl_cli.crypto.Path.home', lambda: home)
+    return home
+
+
+@pytest.fixture(scope="module")
+def sample_keypair():
+    """One (public, private) keypair for tests that only need some valid keys."""
+    return generate_agent_keypair()
+
+
+@pytest.fixture(scope="module")
+def sample_keypair_alt():
+    """A second keypair, distinct from sample_keypair."""
+    return generate_agent_keypair()
+
+
+@pytest.fixture
+def keys_path(tmp_path):
+    """Agent key file inside a per-test temporary directory."""
+    return tmp_path / "agent.key"
+
+
 class TestKeyGeneration:
     """Test suite for cryptographic key generation."""
 
     def test_generate_agent_keypair_returns_valid_keys(self):
-        """Test that key generation returns valid PyNaCl key pair."""
+        """Test that key generation returns a valid, correctly sized PyNaCl key pair."""
         public_key_b64, private_key_b64 = generate_agent_keypair()
 
         # Should return base64-encoded strings
@@ -39,6 +63,10 @@ class TestKeyGeneration:
         public_key_bytes = Base64Encoder.decode(public_key_b64)
         private_key_bytes = Base64Encoder.decode(private_key_b64)
 
+        # PyNaCl key lengths
+        assert len(public_key_bytes) == 32  # 32 bytes for Curve25519 public key
+        assert len(private_key_bytes) == 32  # 32 bytes for Curve25519 private key
+
         # Should be valid PyNaCl keys
         public_key = PublicKey(public_key_bytes)
         private_key = PrivateKey(private_key_bytes)
@@ -55,130 +83,88 @@ class TestKeyGeneration:
         assert pub1 != pub2
         assert priv1 != priv2
 
-    def test_generate_agent_keypair_correct_length(self):
-        """Test that generated keys have correct byte length."""
-        public_key_b64, private_key_b64 = generate_agent_keypair()
-
-        public_key_bytes = Base64Encoder.decode(public_key_b64)
-        private_key_bytes = Base64Encoder.decode(private_key_b64)
-
-        # PyNaCl key lengths
-        assert len(public_key_bytes) == 32  # 32 bytes for Curve25519 public key
-        assert len(private_key_bytes) == 32  # 32 bytes for Curve25519 private key
-
 
 class TestKeyStorage:
     """Test suite for key storage and retrieval."""
 
-    def setup_method(self):
-        """Set up test fixtures with temporary directory."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.keys_path = Path(self.temp_dir) / "agent.key"
-
-    def teardown_method(self):
-        """Clean up temporary files."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def test_get_agent_keys_path_default(self):
-        """Test default agent keys path location."""
-        expected_path = Path.home() / ".config" / "hitl-cli" / "agent.key"
-        assert get_agent_keys_path() == expected_path
-
-    def test_get_agent_keys_path_creates_directory(self):
-        """Test that get_agent_keys_path creates parent directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            Path(temp_dir) / "new_dir" / "agent.key"
-
-            with patch('hitl_cli.crypto.Path.home') as mock_home:
-                mock_home.return_value = Path(temp_dir)
-
-                result_path = get_agent_keys_path()
+    def test_get_agent_keys_path_default(self, isolated_home):
+        """Test default agent keys path location and that its directory is created."""
+        result_path = get_agent_keys_path()
 
-                # Directory should be created
-                assert result_path.parent.exists()
+        assert result_path == isolated_home / ".config" / "hitl-cli" / "agent.key"
+        # Directory should be created
+        assert result_path.parent.is_dir()
 
-    def test_save_agent_keypair(self):
+    def test_save_agent_keypair(self, keys_path, sample_keypair):
         """Test saving agent keypair to file."""
-        public_key, private_key = generate_agent_keypair()
+        public_key, private_key = sample_keypair
 
-        save_agent_keypair(public_key, private_key, self.keys_path)
+        save_agent_keypair(public_key, private_key, keys_path)
 
         # File should exist
-        assert self.keys_path.exists()
+        assert keys_path.exists()
 
         # File should have restricted permissions (600)
-        file_stat = self.keys_path.stat()
-        assert oct(file_stat.st_mode)[-3:] == "600"
+        file_stat = keys_path.stat()
+        assert stat.S_IMODE(file_stat.st_mode) == 0o600
 
-    def test_save_agent_keypair_overwrites_existing(self):
+    def test_save_agent_keypair_overwrites_existing(self, keys_path, sample_keypair, sample_keypair_alt):
         """Test that saving overwrites existing keys."""
         # Create initial keys
-        pub1, priv1 = generate_agent_keypair()
-        save_agent_keypair(pub1, priv1, self.keys_path)
+        pub1, priv1 = sample_keypair
+        save_agent_keypair(pub1, priv1, keys_path)
 
         # Save different keys
-        pub2, priv2 = generate_agent_keypair()
-        save_agent_keypair(pub2, priv2, self.keys_path)
+        pub2, priv2 = sample_keypair_alt
+        save_agent_keypair(pub2, priv2, keys_path)
 
         # Should load the new keys
-        loaded_pub, loaded_priv = load_agent_keypair(self.keys_path)
+        loaded_pub, loaded_priv = load_agent_keypair(keys_path)
         assert loaded_pub == pub2
         assert loaded_priv == priv2
 
-    def test_load_agent_keypair_success(self):
+    def test_load_agent_keypair_success(self, keys_path, sample_keypair):
         """Test loading valid agent keypair from file."""
-        public_key, private_key = generate_agent_keypair()
-        save_agent_keypair(public_key, private_key, self.keys_path)
+        public_key, private_key = sample_keypair
+        save_agent_keypair(public_key, private_key, keys_path)
 
-        loaded_public, loaded_private = load_agent_keypair(self.keys_path)
+        loaded_public, loaded_private = load_agent_keypair(keys_path)
 
         assert loaded_public == public_key
         assert loaded_private == private_key
 
-    def test_load_agent_keypair_file_not_found(self):
+    def test_load_agent_keypair_file_not_found(self, keys_path):
         """Test loading keypair when file doesn't exist."""
-        non_existent_path = Path(self.temp_dir) / "nonexistent.key"
+        non_existent_path = keys_path.parent / "nonexistent.key"
 
         with pytest.raises(FileNotFoundError):
             load_agent_keypair(non_existent_path)
 
-    def test_load_agent_keypair_invalid_format(self):
+    def test_load_agent_keypair_invalid_format(self, keys_path):
         """Test loading keypair from corrupted file."""
         # Write invalid content to key file
-        self.keys_path.write_text("invalid json content")
+        keys_path.write_text("invalid json content")
 
         with pytest.raises((ValueError, KeyError)):
-            load_agent_keypair(self.keys_path)
+            load_agent_keypair(keys_path)
 
-    def test_load_agent_keypair_missing_keys(self):
+    def test_load_agent_keypair_missing_keys(self, keys_path):
         """Test loading keypair with missing key fields."""
         # Write JSON without required keys
         import json
-        self.keys_path.write_text(json.dumps({"invalid": "data"}))
+        keys_path.write_text(json.dumps({"invalid": "data"}))
 
         with pytest.raises(KeyError):
-            load_agent_keypair(self.keys_path)
+            load_agent_keypair(keys_path)
 
 
 class TestKeyEnsurance:
     """Test suite for key ensurance functionality."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.keys_path = Path(self.temp_dir) / "agent.key"
-
-    def teardown_method(self):
-        """Clean up temporary files."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    @pytest.mark.asyncio
     @patch('hitl_cli.crypto.get_agent_keys_path')
-    async def test_ensure_agent_keypair_creates_new_keys(self, mock_get_path):
+    async def test_ensure_agent_keypair_creates_new_keys(self, mock_get_path, keys_path):
         """Test that ensure_agent_keypair creates new keys when none exist."""
-        mock_get_path.return_value = self.keys_path
+        mock_get_path.return_value = keys_path
 
         public_key, private_key = await ensure_agent_keypair()
 
@@ -187,22 +173,21 @@ class TestKeyEnsurance:
         assert isinstance(private_key, str)
 
         # Should create the key file
-        assert self.keys_path.exists()
+        assert keys_path.exists()
 
         # Should be able to load the same keys
-        loaded_pub, loaded_priv = load_agent_keypair(self.keys_path)
+        loaded_pub, loaded_priv = load_agent_keypair(keys_path)
         assert loaded_pub == public_key
         assert loaded_priv == private_key
 
-    @pytest.mark.asyncio
     @patch('hitl_cli.crypto.get_agent_keys_path')
-    async def test_ensure_agent_keypair_loads_existing_keys(self, mock_get_path):
+    async def test_ensure_agent_keypair_loads_existing_keys(self, mock_get_path, keys_path, sample_keypair):
         """Test that ensure_agent_keypair loads existing keys."""
-        mock_get_path.return_value = self.keys_path
+        mock_get_path.return_value = keys_path
 
         # Create existing keys
-        existing_pub, existing_priv = generate_agent_keypair()
-        save_agent_keypair(existing_pub, existing_priv, self.keys_path)
+        existing_pub, existing_priv = sample_keypair
+        save_agent_keypair(existing_pub, existing_priv, keys_path)
 
         # Should load existing keys, not create new ones
         public_key, private_key = await ensure_agent_keypair()
@@ -210,12 +195,11 @@ class TestKeyEnsurance:
         assert public_key == existing_pub
         assert private_key == existing_priv
 
-    @pytest.mark.asyncio
     @patch('hitl_cli.crypto.get_agent_keys_path')
     @patch('hitl_cli.crypto.register_public_key_with_backend', new_callable=AsyncMock)
-    async def test_ensure_agent_keypair_registers_new_keys(self, mock_register, mock_get_path):
+    async def test_ensure_agent_keypair_registers_new_keys(self, mock_register, mock_get_path, keys_path):
         """Test that ensure_agent_keypair registers new keys with backend."""
-        mock_get_path.return_value = self.keys_path
+        mock_get_path.return_value = keys_path
         mock_register.return_value = True
 
         public_key, private_key = await ensure_agent_keypair()
@@ -223,16 +207,15 @@ class TestKeyEnsurance:
         # Should register the public key with backend
         mock_register.assert_awaited_once_with(public_key)
 
-    @pytest.mark.asyncio
     @patch('hitl_cli.crypto.get_agent_keys_path')
     @patch('hitl_cli.crypto.register_public_key_with_backend', new_callable=AsyncMock)
-    async def test_ensure_agent_keypair_skips_registration_for_existing(self, mock_register, mock_get_path):
+    async def test_ensure_agent_keypair_skips_registration_for_existing(self, mock_register, mock_get_path, keys_path, sample_keypair):
         """Test that ensure_agent_keypair doesn't re-register existing keys."""
-        mock_get_path.return_value = self.keys_path
+        mock_get_path.return_value = keys_path
 
         # Create existing keys
-        existing_pub, existing_priv = generate_agent_keypair()
-        save_agent_keypair(existing_pub, existing_priv, self.keys_path)
+        existing_pub, existing_priv = sample_keypair
+        save_agent_keypair(existing_pub, existing_priv, keys_path)
 
         public_key, private_key = await ensure_agent_keypair()
 
@@ -240,40 +223,50 @@ class TestKeyEnsurance:
         mock_register.assert_not_awaited()
 
 
+@pytest.mark.asyncio(loop_scope="class")
 class TestBackendRegistration:
     """Test suite for backend public key registration."""
 
-    @pytest.mark.asyncio
-    @patch('hitl_cli.crypto.get_current_agent_id', return_value='test-agent-id')
-    @patch('hitl_cli.crypto.is_using_api_key', return_value=False)
-    @patch('hitl_cli.crypto.is_using_oauth', return_value=True)
-    @patch('hitl_cli.crypto.get_current_oauth_token', return_value='test-oauth-token')
-    async def test_register_public_key_with_backend_success(self, mock_get_token, mock_is_oauth, mock_is_api_key, mock_get_agent_id):
-        """Test successful public key registration with backend."""
+    @pytest.fixture
+    def mock_http_client(self):
+        """Patch httpx.AsyncClient, yielding the client bound by `async with`."""
         with patch('httpx.AsyncClient') as mock_client_class:
             mock_client = AsyncMock()
             mock_client_class.return_value.__aenter__.return_value = mock_client
             mock_client_class.return_value.__aexit__.return_value = None
+            yield mock_client
+
+    @pytest.mark.parametrize("use_api_key, expected_headers", [
+        pytest.param(False, {"Authorization": "Bearer test-oauth-token"}, id="oauth"),
+        pytest.param(True, {"X-API-Key": "test-api-key"}, id="api-key"),
+    ])
+    @patch('hitl_cli.crypto.get_current_agent_id', return_value='test-agent-id')
+    @patch('hitl_cli.crypto.get_current_oauth_token', return_value='test-oauth-token')
+    @patch('hitl_cli.crypto.get_api_key', return_value='test-api-key')
+    @patch('hitl_cli.crypto.is_using_oauth', return_value=True)
+    @patch('hitl_cli.crypto.is_using_api_key')
+    async def test_register_public_key_with_backend_success(
+        self, mock_is_api_key, mock_is_oauth, mock_get_api_key, mock_get_token, mock_get_agent_id,
+        mock_http_client, use_api_key, expected_headers
+    ):
+        """Test successful public key registration with OAuth or API key authentication."""
+        mock_is_api_key.return_value = use_api_key
+        mock_http_client.post.return_value = SimpleNamespace(status_code=200, text="")
+
+        public_key = "test_public_key_base64"
+        result = await register_public_key_with_backend(public_key)
+
+        assert result is True
+        mock_http_client.post.assert_awaited_once()
+        call_args = mock_http_client.post.call_args
+        assert "/api/v1/keys/register" in call_args[0][0]
+        assert call_args[1]['json'] == {
+            "entity_type": "agent",
+            "entity_id": "test-agent-id",
+            "public_key": public_key
+        }
+        assert call_args[1]['headers'] == {"Content-Type": "application/json", **expected_headers}
 
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_client.post.return_value = mock_response
-
-            public_key = "test_public_key_base64"
-            result = await register_public_key_with_backend(public_key)
-
-            assert result is True
-            mock_client.post.assert_awaited_once()
-            call_args = mock_client.post.call_args
-            assert "/api/v1/keys/register" in call_args[0][0]
-            assert call_args[1]['json'] == {
-                "entity_type": "agent",
-                "entity_id": "test-agent-id",
-                "public_key": public_key
-            }
-            assert call_args[1]['headers']['Authorization'] == 'Bearer test-oauth-token'
-
-    @pytest.mark.asyncio
     @patch('hitl_cli.crypto.get_current_agent_id', return_value=None)
     async def test_register_public_key_with_backend_failure(self, mock_get_agent_id):
         """Test public key registration failure when no agent ID."""
@@ -282,44 +275,15 @@ class TestBackendRegistration:
 
         assert result is False
 
-    @pytest.mark.asyncio
     @patch('hitl_cli.crypto.get_current_agent_id', return_value='test-agent-id')
     @patch('hitl_cli.crypto.is_using_oauth', return_value=True)
     @patch('hitl_cli.crypto.get_current_oauth_token', return_value='test-oauth-token')
-    async def test_register_public_key_with_backend_http_error(self, mock_get_token, mock_is_oauth, mock_get_agent_id):
+    async def test_register_public_key_with_backend_http_error(self, mock_get_token, mock_is_oauth, mock_get_agent_id, mock_http_client):
         """Test public key registration with HTTP error."""
-        with patch('httpx.AsyncClient.post', side_effect=Exception("HTTP Error")):
-            public_key = "test_public_key_base64"
-            result = await register_public_key_with_backend(public_key)
-
-            assert result is False
+        mock_http_client.post.side_effect = Exception("HTTP Error")
 
-    @pytest.mark.asyncio
-    @patch('hitl_cli.crypto.get_current_agent_id', return_value='test-agent-id')
-    @patch('hitl_cli.crypto.is_using_oauth', return_value=False)
-    @patch('hitl_cli.crypto.is_using_api_key', return_value=True)
-    @patch('hitl_cli.crypto.get_api_key', return_value='test-api-key')
-    async def test_register_public_key_with_backend_api_key(self, mock_get_api_key, mock_is_api_key, mock_is_oauth, mock_get_agent_id):
-        """Test successful public key registration with API key authentication."""
-        with patch('httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-            mock_client_class.return_value.__aexit__.return_value = None
+        public_key = "test_public_key_base64"
+        result = await register_public_key_with_backend(public_key)
 
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_client.post.return_value = mock_response
-
-            public_key = "test_public_key_base64"
-            result = await register_public_key_with_backend(public_key)
-
-            assert result is True
-            mock_client.post.assert_awaited_once()
-            call_args = mock_client.post.call_args
-            assert "/api/v1/keys/register" in call_args[0][0]
-            assert call_args[1]['json'] == {
-                "entity_type": "agent",
-                "entity_id": "test-agent-id",
-                "public_key": public_key
-            }
-            assert call_args[1]['headers']['X-API-Key'] == 'test-api-key'
+        assert result is False
+        mock_http_client.post.assert_awaited_once()
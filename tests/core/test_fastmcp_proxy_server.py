@@ -10,6 +10,8 @@ These tests MUST FAIL initially, then pass after proper implementation.
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from nacl.encoding import Base64Encoder
+from nacl.public import Box, PrivateKey
 
 # Import the new implementation (will fail initially)
 try:
@@ -22,6 +24,39 @@ except ImportError:
     Client = None
 
 
+@pytest.fixture(scope="module")
+def agent_private_key():
+    """Agent private key generated once for the module (keys are never mutated)."""
+    return PrivateKey.generate()
+
+
+@pytest.fixture(scope="module")
+def device_private_key():
+    """Device private key generated once for the module."""
+    return PrivateKey.generate()
+
+
+@pytest.fixture(scope="module")
+def device_public_key_b64(device_private_key):
+    """Device public key encoded once, as the backend returns it."""
+    return device_private_key.public_key.encode(Base64Encoder).decode()
+
+
+@pytest.fixture(scope="module")
+def agent_keypair_b64(agent_private_key):
+    """Agent keypair as base64 strings, in the shape load_agent_keypair returns."""
+    return (
+        agent_private_key.public_key.encode(Base64Encoder).decode(),
+        agent_private_key.encode(Base64Encoder).decode()
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_load_keys(monkeypatch, agent_keypair_b64):
+    """Serve the module's agent keypair to the proxy instead of reading it from disk."""
+    monkeypatch.setattr('hitl_cli.proxy_handler_v2.load_agent_keypair', lambda: agent_keypair_b64)
+
+
 class TestFastMCPProxyServerCompliance:
     """Test suite for FastMCP proxy server compliance."""
 
@@ -29,7 +64,6 @@ class TestFastMCPProxyServerCompliance:
         """Set up test fixtures."""
         self.backend_url = "https://test-backend.com"
 
-    @pytest.mark.asyncio
     async def test_proxy_server_is_valid_mcp_server(self):
         """Test that proxy is a valid MCP server using FastMCP testing utilities.
         
@@ -62,21 +96,8 @@ class TestFastMCPProxyServerCompliance:
             }
         ]
 
-        # Generate test keypairs
-        from nacl.encoding import Base64Encoder
-        from nacl.public import PrivateKey
-
-        test_private_key = PrivateKey.generate()
-        test_public_key = test_private_key.public_key
-
-        with patch('hitl_cli.proxy_handler_v2.get_backend_tools') as mock_get_tools, \
-             patch('hitl_cli.proxy_handler_v2.load_agent_keypair') as mock_load_keys:
-
+        with patch('hitl_cli.proxy_handler_v2.get_backend_tools') as mock_get_tools:
             mock_get_tools.return_value = mock_backend_tools
-            mock_load_keys.return_value = (
-                test_public_key.encode(Base64Encoder).decode(),
-                test_private_key.encode(Base64Encoder).decode()
-            )
 
             # Create FastMCP proxy server
             server = create_fastmcp_proxy_server(self.backend_url)
@@ -97,7 +118,6 @@ class TestFastMCPProxyServerCompliance:
                 assert "request_human_input_e2ee" not in tool_names, "E2EE tools must be filtered"
                 assert "notify_human_e2ee" not in tool_names, "E2EE tools must be filtered"
 
-    @pytest.mark.asyncio
     async def test_mcp_server_initialization_and_capabilities(self):
         """Test proper MCP server initialization and capabilities.
         
@@ -106,21 +126,8 @@ class TestFastMCPProxyServerCompliance:
         if create_fastmcp_proxy_server is None:
             pytest.fail("FastMCP proxy server implementation not found - this test should fail initially")
 
-        # Generate test keypairs
-        from nacl.encoding import Base64Encoder
-        from nacl.public import PrivateKey
-
-        test_private_key = PrivateKey.generate()
-        test_public_key = test_private_key.public_key
-
-        with patch('hitl_cli.proxy_handler_v2.get_backend_tools') as mock_get_tools, \
-             patch('hitl_cli.proxy_handler_v2.load_agent_keypair') as mock_load_keys:
-
+        with patch('hitl_cli.proxy_handler_v2.get_backend_tools') as mock_get_tools:
             mock_get_tools.return_value = []
-            mock_load_keys.return_value = (
-                test_public_key.encode(Base64Encoder).decode(),
-                test_private_key.encode(Base64Encoder).decode()
-            )
 
             server = create_fastmcp_proxy_server(self.backend_url)
 
@@ -134,7 +141,6 @@ class TestFastMCPProxyServerCompliance:
                 assert hasattr(server, '_tool_manager'), "Server must have tool manager"
                 assert hasattr(server, 'name'), "Server must have name attribute"
 
-    @pytest.mark.asyncio
     async def test_request_human_input_e2ee_transparency(self):
         """Test that request_human_input transparently handles E2EE encryption.
         
@@ -151,13 +157,11 @@ class TestFastMCPProxyServerCompliance:
         with patch('hitl_cli.proxy_handler_v2.get_device_public_keys') as mock_get_keys, \
              patch('hitl_cli.proxy_handler_v2.encrypt_arguments') as mock_encrypt, \
              patch('hitl_cli.proxy_handler_v2.decrypt_response') as mock_decrypt, \
-             patch('hitl_cli.proxy_handler_v2.BackendMCPClient') as mock_backend_client, \
-             patch('hitl_cli.proxy_handler_v2.load_agent_keypair') as mock_load_keys:
+             patch('hitl_cli.proxy_handler_v2.BackendMCPClient') as mock_backend_client:
 
             mock_get_keys.return_value = mock_device_keys
             mock_encrypt.return_value = mock_encrypted_payload
             mock_decrypt.return_value = mock_decrypted_response
-            mock_load_keys.return_value = ("AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=", "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=")
 
             # Mock backend client
             mock_client = AsyncMock()
@@ -185,7 +189,6 @@ class TestFastMCPProxyServerCompliance:
                 # Verify Claude receives plaintext response
                 assert result is not None, "Tool execution must return result"
 
-    @pytest.mark.asyncio
     async def test_proper_json_rpc_error_handling(self):
         """Test proper JSON-RPC 2.0 error handling in FastMCP server.
         
@@ -194,11 +197,9 @@ class TestFastMCPProxyServerCompliance:
         if create_fastmcp_proxy_server is None:
             pytest.fail("FastMCP proxy server implementation not found - this test should fail initially")
 
-        with patch('hitl_cli.proxy_handler_v2.get_device_public_keys') as mock_get_keys, \
-             patch('hitl_cli.proxy_handler_v2.load_agent_keypair') as mock_load_keys:
+        with patch('hitl_cli.proxy_handler_v2.get_device_public_keys') as mock_get_keys:
             # Simulate error condition
             mock_get_keys.side_effect = Exception("Device keys unavailable")
-            mock_load_keys.return_value = ("AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=", "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=")
 
             server = create_fastmcp_proxy_server(self.backend_url)
 
@@ -219,7 +220,6 @@ class TestFastMCPProxyServerIntegration:
         """Set up test fixtures."""
         self.backend_url = "https://test-backend.com"
 
-    @pytest.mark.asyncio
     async def test_fastmcp_server_preserves_existing_proxy_behavior(self):
         """Test that FastMCP implementation preserves all existing proxy behaviors.
         
@@ -250,21 +250,8 @@ class TestFastMCPProxyServerIntegration:
             }
         ]
 
-        # Generate test keypairs
-        from nacl.encoding import Base64Encoder
-        from nacl.public import PrivateKey
-
-        test_private_key = PrivateKey.generate()
-        test_public_key = test_private_key.public_key
-
-        with patch('hitl_cli.proxy_handler_v2.get_backend_tools') as mock_get_tools, \
-             patch('hitl_cli.proxy_handler_v2.load_agent_keypair') as mock_load_keys:
-
+        with patch('hitl_cli.proxy_handler_v2.get_backend_tools') as mock_get_tools:
             mock_get_tools.return_value = mock_backend_tools
-            mock_load_keys.return_value = (
-                test_public_key.encode(Base64Encoder).decode(),
-                test_private_key.encode(Base64Encoder).decode()
-            )
 
             server = create_fastmcp_proxy_server(self.backend_url)
 
@@ -289,8 +276,79 @@ class TestFastMCPProxyServerIntegration:
             pytest.fail("FastMCP proxy server implementation not found - this test should fail initially")
 
         # Test that server can be created even with invalid URL (validation happens at runtime)
-        with patch('hitl_cli.proxy_handler_v2.load_agent_keypair') as mock_load_keys:
-            mock_load_keys.return_value = ("AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=", "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=")
-            server = create_fastmcp_proxy_server("invalid-url")
-            assert isinstance(server, FastMCP), "Server creation should succeed"
-            assert server.name == "hitl-e2ee-proxy", "Server should have correct name"
+        server = create_fastmcp_proxy_server("invalid-url")
+        assert isinstance(server, FastMCP), "Server creation should succeed"
+        assert server.name == "hitl-e2ee-proxy", "Server should have correct name"
+
+
+class TestDeviceKeyRetrieval:
+    """Tests for fetching device public keys from the backend."""
+
+    @pytest.fixture
+    def backend_http(self, mock_http):
+        """OAuth-authenticated in-memory backend behind the shared backend HTTP client."""
+        client, router = mock_http
+        with patch('hitl_cli.proxy_handler_v2.is_using_oauth', return_value=True), \
+             patch('hitl_cli.proxy_handler_v2.get_current_oauth_token', return_value="oauth-token"), \
+             patch('hitl_cli.proxy_handler_v2._get_backend_http', return_value=client):
+            yield router
+
+    async def test_device_key_request_sends_bearer_token(self, backend_http):
+        """Test device key lookups authenticate with the OAuth bearer token."""
+        from hitl_cli.proxy_handler_v2 import get_device_public_keys
+
+        backend_http.add("GET", "/api/v1/devices/public-keys", 200, {"public_keys": ["device-key"]})
+
+        assert await get_device_public_keys() == ["device-key"]
+        assert len(backend_http.calls) == 1
+        assert backend_http.calls[0].headers["Authorization"] == "Bearer oauth-token"
+
+    @pytest.mark.parametrize("status, payload, expected", [
+        pytest.param(200, {"public_keys": ["key-a", "key-b"]}, ["key-a", "key-b"], id="keys"),
+        pytest.param(200, {"public_keys": []}, [], id="no-devices"),
+        pytest.param(404, {"detail": "Not found"}, None, id="http-error"),
+    ])
+    async def test_get_device_public_keys_responses(self, backend_http, status, payload, expected):
+        """Test device key lookup results for success, no devices and backend errors."""
+        from hitl_cli.proxy_handler_v2 import get_device_public_keys
+
+        backend_http.add("GET", "/api/v1/devices/public-keys", status, payload)
+
+        if expected is None:
+            with pytest.raises(Exception, match=f"Failed to get device public keys: {status}"):
+                await get_device_public_keys()
+        else:
+            assert await get_device_public_keys() == expected
+
+
+class TestE2EEEncryption:
+    """Tests for the proxy's argument encryption and response decryption."""
+
+    def test_encrypt_decrypt_round_trip_reuses_box(self, agent_private_key, device_private_key, device_public_key_b64):
+        """Test payloads round-trip between agent and device and the box is reused."""
+        import base64
+        import json
+
+        from hitl_cli.proxy_handler_v2 import (
+            _get_box,
+            decrypt_response,
+            encrypt_arguments,
+        )
+
+        device_box = Box(device_private_key, agent_private_key.public_key)
+
+        _get_box.cache_clear()
+
+        # Device can decrypt what the agent encrypted
+        encrypted_payload = encrypt_arguments({"prompt": "Test prompt"}, [device_public_key_b64], agent_private_key)
+        decrypted = device_box.decrypt(base64.b64decode(encrypted_payload))
+        assert json.loads(decrypted) == {"prompt": "Test prompt"}
+
+        # Agent can decrypt what the device encrypted
+        encrypted_response = base64.b64encode(device_box.encrypt(b"Human response")).decode()
+        assert decrypt_response(encrypted_response, device_public_key_b64, agent_private_key) == "Human response"
+
+        # The shared key was derived once for both directions
+        cache_info = _get_box.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
@@ -0,0 +1,89 @@
+"""
+Tests for the event-loop-scoped shared HTTP client.
+"""
+
+import asyncio
+
+import pytest
+
+from hitl_cli.api_client import _get_api_http
+from hitl_cli.auth import _get_oauth_http
+from hitl_cli.http_pool import LoopBoundClient
+from hitl_cli.proxy_handler_v2 import _get_backend_http
+
+
+@pytest.mark.parametrize("get_client", [
+    pytest.param(_get_api_http, id="api"),
+    pytest.param(_get_oauth_http, id="oauth"),
+    pytest.param(_get_backend_http, id="backend"),
+])
+def test_client_shared_within_loop_and_closed_with_it(get_client):
+    """Test each pooled client is reused per event loop and closed when that loop shuts down"""
+
+    async def get_clients():
+        first, second = get_client(), get_client()
+        assert not first.is_closed
+        return first, second
+
+    first, second = asyncio.run(get_clients())
+    assert first is second
+    # asyncio.run() closed the pooled client before closing its loop
+    assert first.is_closed
+
+    # A new event loop must not reuse connections pooled on the old one
+    third, _ = asyncio.run(get_clients())
+    assert third is not first
+    assert third.is_closed
+
+
+async def test_client_replaced_after_being_closed():
+    """Test a client closed by its user is replaced on the next request"""
+    pool = LoopBoundClient()
+
+    first = pool.get()
+    await first.aclose()
+
+    second = pool.get()
+    assert second is not first
+    assert not second.is_closed
+
+
+def test_client_closed_by_manually_driven_loop_shutdown():
+    """Test a loop run without asyncio.run() closes its client in shutdown_asyncgens()"""
+    pool = LoopBoundClient()
+
+    async def get_client():
+        return pool.get()
+
+    loop = asyncio.new_event_loop()
+    try:
+        client = loop.run_until_complete(get_client())
+        assert not client.is_closed
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+
+    assert client.is_closed
+
+
+def test_clients_kept_per_live_loop():
+    """Test interleaved loops each keep their own client instead of replacing each other's"""
+    pool = LoopBoundClient()
+
+    async def get_client():
+        return pool.get()
+
+    first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+    try:
+        first = first_loop.run_until_complete(get_client())
+        second = second_loop.run_until_complete(get_client())
+
+        assert second is not first
+        assert first_loop.run_until_complete(get_client()) is first
+        assert second_loop.run_until_complete(get_client()) is second
+    finally:
+        for loop in (first_loop, second_loop):
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    assert first.is_closed and second.is_closed
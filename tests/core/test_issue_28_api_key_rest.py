@@ -1,12 +1,10 @@
 import os
 from unittest.mock import AsyncMock, patch
 
-import pytest
 from hitl_cli.mcp_client import MCPClient
 from hitl_cli.sdk import HITL
 
 
-@pytest.mark.asyncio
 @patch.dict(os.environ, {"HITL_API_KEY": "test_api_key"})
 @patch("hitl_cli.api_client.ApiClient")
 @patch("hitl_cli.sdk.MCPClient")
@@ -28,7 +26,6 @@ async def test_sdk_uses_rest_with_api_key(mock_mcp_class, mock_api_client_class)
     assert mock_mcp_class.return_value.request_human_input_api_key.call_count == 0
     assert mock_mcp_class.return_value.call_tool.call_count == 0
 
-@pytest.mark.asyncio
 @patch.dict(os.environ, {"HITL_API_KEY": "test_api_key"})
 @patch("hitl_cli.mcp_client.ApiClient")
 async def test_mcp_client_uses_rest_with_api_key(mock_api_client_class):
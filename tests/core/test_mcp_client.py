@@ -208,7 +208,6 @@ class TestMCPClientErrorHandling:
 class TestOAuthTokenRefresh:
     """Test OAuth token refresh functionality"""
 
-    @pytest.mark.asyncio
     async def test_get_oauth_token_raises_when_expired_without_refresh_token(self):
         """Test that _get_oauth_token raises exception when token expired and no refresh token"""
         client = MCPClient()
@@ -228,7 +227,6 @@ class TestOAuthTokenRefresh:
                 assert "expired and no refresh token is available" in str(exc_info.value)
                 assert "hitl-cli login" in str(exc_info.value)
 
-    @pytest.mark.asyncio
     async def test_get_oauth_token_refreshes_expired_token_successfully(self):
         """Test that _get_oauth_token successfully refreshes an expired token"""
         client = MCPClient()
@@ -271,7 +269,6 @@ class TestOAuthTokenRefresh:
                             # Verify new token was returned
                             assert result == 'new_fresh_token'
 
-    @pytest.mark.asyncio
     async def test_get_oauth_token_raises_when_refresh_fails(self):
         """Test that _get_oauth_token raises exception when token refresh fails"""
         client = MCPClient()
@@ -297,7 +294,6 @@ class TestOAuthTokenRefresh:
 
                         assert "Failed to refresh OAuth token" in str(exc_info.value)
 
-    @pytest.mark.asyncio
     async def test_get_oauth_token_raises_when_client_data_missing(self):
         """Test that _get_oauth_token raises exception when OAuth client data not found"""
         client = MCPClient()
@@ -317,7 +313,6 @@ class TestOAuthTokenRefresh:
 
                     assert "OAuth client data not found" in str(exc_info.value)
 
-    @pytest.mark.asyncio
     async def test_get_oauth_token_returns_valid_token_without_refresh(self):
         """Test that _get_oauth_token returns valid token without refresh attempt"""
         client = MCPClient()
@@ -336,7 +331,6 @@ class TestOAuthTokenRefresh:
                 # Should return existing token without refresh
                 assert result == 'valid_token'
 
-    @pytest.mark.asyncio
     async def test_get_oauth_token_preserves_refresh_token_when_not_returned(self):
         """Test that _get_oauth_token preserves refresh token if backend doesn't return it"""
         client = MCPClient()
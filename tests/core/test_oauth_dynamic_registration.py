@@ -12,12 +12,34 @@ This test module validates:
 import base64
 import hashlib
 import json
+import re
+import stat
 from unittest.mock import AsyncMock, Mock, patch
+from urllib.parse import parse_qs
 
+import httpx
 import pytest
 from hitl_cli.main import app
 from typer.testing import CliRunner
 
+# RFC 7636 unreserved characters allowed in a PKCE code verifier
+_PKCE_VERIFIER_RE = re.compile(r'[A-Za-z0-9._~-]+')
+
+
+@pytest.fixture
+def mock_oauth_http(mock_http, monkeypatch):
+    """Serve the shared OAuth HTTP client from an in-memory router"""
+    client, router = mock_http
+    monkeypatch.setattr('hitl_cli.auth._get_oauth_http', lambda: client)
+    return router
+
+
+@pytest.fixture(scope="module")
+def oauth_client():
+    """OAuth dynamic client shared across tests (it holds no per-flow state)"""
+    from hitl_cli.auth import OAuthDynamicClient
+    return OAuthDynamicClient()
+
 
 class TestOAuthDynamicRegistration:
     """Test OAuth 2.1 dynamic client registration"""
@@ -73,7 +95,42 @@ class TestOAuthDynamicRegistration:
                         # Verify keys were ensured
                         mock_ensure_keys.assert_called_once()
 
-    def test_oauth_pkce_flow(self, runner, mock_config_dir):
+    async def test_register_client_posts_rfc7591_payload(self, mock_oauth_http, oauth_client):
+        """Test dynamic client registration request and response handling"""
+
+        mock_oauth_http.add("POST", "/api/v1/oauth/register", 201, {
+            "client_id": "dynamic-client-123",
+            "client_secret": "secret-456"
+        })
+
+        client_info = await oauth_client._register_client("Test Agent")
+
+        assert client_info["client_id"] == "dynamic-client-123"
+        assert client_info["client_secret"] == "secret-456"
+
+        assert len(mock_oauth_http.calls) == 1
+        request = mock_oauth_http.calls[0]
+        assert request.url.path == "/api/v1/oauth/register"
+        request_data = json.loads(request.content)
+        assert request_data["client_name"] == "HITL CLI - Test Agent"
+        assert request_data["redirect_uris"] == ["http://localhost:8080/callback"]
+        assert request_data["grant_types"] == ["authorization_code"]
+        assert request_data["token_endpoint_auth_method"] == "client_secret_post"
+
+    async def test_register_clients_with_multiple_backends(self, mock_oauth_http, oauth_client):
+        """Test registering with several backends issues one request per backend"""
+
+        mock_oauth_http.add("POST", "/api/v1/oauth/register", 201, {"client_id": "dynamic-client-123"})
+
+        base_urls = ["https://one.example.com", "https://two.example.com", "https://three.example.com"]
+        results = await oauth_client.register_clients(base_urls, "Test Agent")
+
+        assert [result["client_id"] for result in results] == ["dynamic-client-123"] * 3
+        assert sorted(request.url.host for request in mock_oauth_http.calls) == sorted(
+            ["one.example.com", "two.example.com", "three.example.com"]
+        )
+
+    async def test_oauth_pkce_flow(self, runner, mock_config_dir, mock_oauth_http, oauth_client):
         """Test OAuth 2.1 + PKCE authorization flow"""
 
         # Mock registered client
@@ -94,51 +151,62 @@ class TestOAuthDynamicRegistration:
                     mock_server.return_value = mock_server_instance
 
                     # Mock token exchange
-                    with patch('httpx.AsyncClient.post', new_callable=AsyncMock) as mock_post:
-                        token_response = {
-                            "access_token": "oauth-bearer-token",
-                            "token_type": "Bearer",
-                            "expires_in": 3600,
-                            "refresh_token": "refresh-token-123"
-                        }
-
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = token_response
-                        mock_post.return_value = mock_response
-
-                        from hitl_cli.auth import OAuthDynamicClient
-                        client = OAuthDynamicClient()
-
-                        # Test PKCE parameters generation
-                        code_verifier = client._generate_code_verifier()
-                        code_challenge = client._generate_code_challenge(code_verifier)
-
-                        assert len(code_verifier) >= 43
-                        assert len(code_verifier) <= 128
-                        assert code_challenge != code_verifier
-
-                        # Verify code challenge generation
-                        expected_challenge = base64.urlsafe_b64encode(
-                            hashlib.sha256(code_verifier.encode()).digest()
-                        ).decode().rstrip('=')
-                        assert code_challenge == expected_challenge
-
-                        # Test token exchange (async)
-                        import asyncio
-                        asyncio.run(client._exchange_authorization_code(
-                            client_id="dynamic-client-123",
-                            client_secret="secret-456",
-                            authorization_code="auth-code-123",
-                            code_verifier="code-verifier-123",
-                            agent_name="Test Agent"
-                        ))
-
-                        # Verify token exchange was called with correct headers
-                        mock_post.assert_awaited_once()
-                        call_args = mock_post.await_args
-                        headers = call_args[1]["headers"]
-                        assert headers["X-MCP-Agent-Name"] == "Test Agent"
+                    mock_oauth_http.add("POST", "/api/v1/oauth/token", 200, {
+                        "access_token": "oauth-bearer-token",
+                        "token_type": "Bearer",
+                        "expires_in": 3600,
+                        "refresh_token": "refresh-token-123"
+                    })
+
+                    # Test PKCE parameters generation
+                    code_verifier = oauth_client._generate_code_verifier()
+                    code_challenge = oauth_client._generate_code_challenge(code_verifier)
+
+                    assert len(code_verifier) >= 43
+                    assert len(code_verifier) <= 128
+                    assert code_challenge != code_verifier
+
+                    # Verify code challenge generation
+                    expected_challenge = base64.urlsafe_b64encode(
+                        hashlib.sha256(code_verifier.encode()).digest()
+                    ).decode().rstrip('=')
+                    assert code_challenge == expected_challenge
+
+                    # Test token exchange
+                    await oauth_client._exchange_authorization_code(
+                        client_id="dynamic-client-123",
+                        client_secret="secret-456",
+                        authorization_code="auth-code-123",
+                        code_verifier="code-verifier-123",
+                        agent_name="Test Agent"
+                    )
+
+                    # Verify token exchange was called with correct headers
+                    assert len(mock_oauth_http.calls) == 1
+                    assert mock_oauth_http.calls[0].headers["X-MCP-Agent-Name"] == "Test Agent"
+
+    def test_callback_server_signals_when_callback_handled(self):
+        """Test the callback server records the redirect and signals completion"""
+
+        import threading
+
+        from hitl_cli.auth import OAuthDynamicClient
+        client = OAuthDynamicClient()
+
+        callback_data = {}
+        callback_received = threading.Event()
+        # Let the OS pick a free port
+        with patch.object(OAuthDynamicClient, 'CALLBACK_PORT', 0):
+            server = client._start_callback_server(callback_data, on_callback=callback_received.set)
+        try:
+            port = server.server_address[1]
+            response = httpx.get(f"http://localhost:{port}/callback?code=auth-code-123&state=test-state")
+
+            assert response.status_code == 200
+            assert callback_received.wait(timeout=5)
+            assert callback_data == {"code": "auth-code-123", "state": "test-state"}
+        finally:
+            server.server_close()
 
     def test_oauth_bearer_token_storage(self, runner, mock_config_dir):
         """Test OAuth Bearer token storage and retrieval"""
@@ -162,38 +230,64 @@ class TestOAuthDynamicRegistration:
         assert loaded_token["token_type"] == "Bearer"
         assert loaded_token["refresh_token"] == "refresh-token-123"
 
-    def test_x_mcp_agent_name_header(self, runner, mock_config_dir):
+    def test_oauth_token_load_is_cached_until_saved(self, runner, mock_config_dir):
+        """Test repeated loads reuse the parsed token until the file is rewritten"""
+
+        from hitl_cli.auth import load_oauth_token, save_oauth_token
+
+        save_oauth_token({"access_token": "first-token"})
+
+        with patch('hitl_cli.auth.json.loads', wraps=json.loads) as mock_loads:
+            assert load_oauth_token()["access_token"] == "first-token"
+            assert load_oauth_token()["access_token"] == "first-token"
+            assert mock_loads.call_count == 1
+
+            save_oauth_token({"access_token": "second-token"})
+            assert load_oauth_token()["access_token"] == "second-token"
+            assert mock_loads.call_count == 2
+
+    def test_oauth_token_cache_detects_replaced_file_with_same_mtime(self, runner, mock_config_dir):
+        """Test a same-size token swapped in by os.replace is reloaded even if the mtime is unchanged"""
+        import os
+
+        from hitl_cli.auth import load_oauth_token, save_oauth_token
+
+        save_oauth_token({"access_token": "first-token"})
+        token_file = mock_config_dir / "oauth_token.json"
+        assert load_oauth_token()["access_token"] == "first-token"
+        old_stat = token_file.stat()
+
+        # Another process refreshes the token on a filesystem with coarse timestamps
+        replacement = mock_config_dir / "oauth_token.json.new"
+        replacement.write_text(json.dumps({"access_token": "other-token"}))
+        os.utime(replacement, ns=(old_stat.st_atime_ns, old_stat.st_mtime_ns))
+        os.replace(replacement, token_file)
+
+        assert token_file.stat().st_size == old_stat.st_size
+        assert load_oauth_token()["access_token"] == "other-token"
+
+    async def test_x_mcp_agent_name_header(self, runner, mock_config_dir, mock_oauth_http, oauth_client):
         """Test X-MCP-Agent-Name header during token exchange"""
 
         agent_name = "My Custom Agent"
 
-        with patch('httpx.AsyncClient.post', new_callable=AsyncMock) as mock_post:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {
-                "access_token": "oauth-bearer-token",
-                "token_type": "Bearer"
-            }
-            mock_post.return_value = mock_response
-
-            from hitl_cli.auth import OAuthDynamicClient
-            client = OAuthDynamicClient()
+        mock_oauth_http.add("POST", "/api/v1/oauth/token", 200, {
+            "access_token": "oauth-bearer-token",
+            "token_type": "Bearer"
+        })
 
-            # Mock the token exchange call (async)
-            import asyncio
-            asyncio.run(client._exchange_authorization_code(
-                client_id="test-client-id",
-                client_secret=None,
-                authorization_code="auth-code-123",
-                code_verifier="code-verifier-123",
-                agent_name=agent_name
-            ))
+        # Run the token exchange
+        await oauth_client._exchange_authorization_code(
+            client_id="test-client-id",
+            client_secret=None,
+            authorization_code="auth-code-123",
+            code_verifier="code-verifier-123",
+            agent_name=agent_name
+        )
 
-            # Verify X-MCP-Agent-Name header was included
-            mock_post.assert_awaited_once()
-            call_args = mock_post.await_args
-            headers = call_args[1]["headers"]
-            assert headers["X-MCP-Agent-Name"] == agent_name
+        # Verify X-MCP-Agent-Name header was included
+        assert len(mock_oauth_http.calls) == 1
+        assert mock_oauth_http.calls[0].headers["X-MCP-Agent-Name"] == agent_name
 
 
 
@@ -225,7 +319,7 @@ class TestMCPOAuthIntegration:
             with patch('hitl_cli.auth.OAUTH_TOKEN_FILE', token_file):
                 yield token_data
 
-    def test_mcp_client_oauth_auth(self, mock_oauth_token):
+    async def test_mcp_client_oauth_auth(self, mock_oauth_token):
         """Test MCP client uses OAuth Bearer authentication"""
 
         from hitl_cli.mcp_client import MCPClient
@@ -243,11 +337,10 @@ class TestMCPOAuthIntegration:
             mock_client_instance.call_tool.return_value = mock_result
 
             # Test OAuth Bearer authentication
-            import asyncio
-            result = asyncio.run(client.request_human_input_oauth(
+            result = await client.request_human_input_oauth(
                 "Test prompt",
                 agent_name="Test Agent"
-            ))
+            )
 
             assert result == "Human response"
 
@@ -260,7 +353,7 @@ class TestMCPOAuthIntegration:
             assert hasattr(auth_handler, 'token')
             assert auth_handler.token == "oauth-bearer-token"
 
-    def test_mcp_client_oauth_token_refresh(self):
+    async def test_mcp_client_oauth_token_refresh(self, mock_oauth_http):
         """Test MCP client handles OAuth token refresh"""
 
         # Mock expired token
@@ -273,58 +366,76 @@ class TestMCPOAuthIntegration:
 
         with patch('hitl_cli.mcp_client.load_oauth_token', return_value=expired_token_data):
             with patch('hitl_cli.mcp_client.load_oauth_client', return_value={'client_id': 'test-client', 'client_secret': 'test-secret'}):
-                with patch('httpx.AsyncClient.post', new_callable=AsyncMock) as mock_post:
+                with patch('hitl_cli.mcp_client.save_oauth_token'):
                     # Mock refresh token response
-                    refresh_response = {
+                    mock_oauth_http.add("POST", "/api/v1/oauth/token", 200, {
                         "access_token": "new-oauth-token",
                         "token_type": "Bearer",
                         "expires_in": 3600
-                    }
-
-                    mock_response = Mock()
-                    mock_response.status_code = 200
-                    mock_response.json.return_value = refresh_response
-                    mock_post.return_value = mock_response
+                    })
 
                     from hitl_cli.mcp_client import MCPClient
                     client = MCPClient()
 
                     # Test token refresh
-                    import asyncio
-                    token = asyncio.run(client._get_oauth_token())
+                    token = await client._get_oauth_token()
 
                     assert token == "new-oauth-token"
 
                     # Verify refresh token was used
-                    mock_post.assert_awaited_once()
-                    call_args = mock_post.await_args
-                    request_data = call_args[1]["data"]
-                    assert request_data["grant_type"] == "refresh_token"
-                    assert request_data["refresh_token"] == "refresh-token-123"
+                    assert len(mock_oauth_http.calls) == 1
+                    request_data = parse_qs(mock_oauth_http.calls[0].content.decode())
+                    assert request_data["grant_type"] == ["refresh_token"]
+                    assert request_data["refresh_token"] == ["refresh-token-123"]
+
+    async def test_mcp_client_concurrent_refresh_is_coalesced(self, mock_oauth_http):
+        """Test concurrent callers with an expired token share a single refresh request"""
+
+        expired_token_data = {
+            "access_token": "expired-oauth-token",
+            "token_type": "Bearer",
+            "expires_at": 1234567890 - 3600,  # Expired
+            "refresh_token": "refresh-token-123"
+        }
+
+        with patch('hitl_cli.mcp_client.load_oauth_token', return_value=expired_token_data), \
+             patch('hitl_cli.mcp_client.load_oauth_client', return_value={'client_id': 'test-client'}), \
+             patch('hitl_cli.mcp_client.save_oauth_token') as mock_save:
+            mock_oauth_http.add("POST", "/api/v1/oauth/token", 200, {
+                "access_token": "new-oauth-token",
+                "token_type": "Bearer",
+                "expires_in": 3600
+            })
+
+            from hitl_cli.mcp_client import MCPClient
+            client = MCPClient()
+
+            import asyncio
+
+            tokens = await asyncio.gather(*(client._get_oauth_token() for _ in range(10)))
+
+            assert tokens == ["new-oauth-token"] * 10
+            assert len(mock_oauth_http.calls) == 1
+            mock_save.assert_called_once()
 
 
 class TestOAuthSecurityFeatures:
     """Test OAuth security features and token management"""
 
-    def test_pkce_code_challenge_generation(self):
+    def test_pkce_code_challenge_generation(self, oauth_client):
         """Test PKCE code challenge generation follows RFC 7636"""
 
-        from hitl_cli.auth import OAuthDynamicClient
-        client = OAuthDynamicClient()
-
         # Test code verifier generation
-        code_verifier = client._generate_code_verifier()
+        code_verifier = oauth_client._generate_code_verifier()
 
         # Verify length requirements (43-128 characters)
         assert 43 <= len(code_verifier) <= 128
 
         # Verify character set (unreserved characters)
-        import re
-        pattern = re.compile(r'^[A-Za-z0-9\-\._~]+$')
-        assert pattern.match(code_verifier)
+        assert _PKCE_VERIFIER_RE.fullmatch(code_verifier)
 
         # Test code challenge generation
-        code_challenge = client._generate_code_challenge(code_verifier)
+        code_challenge = oauth_client._generate_code_challenge(code_verifier)
 
         # Verify SHA256 + base64url encoding
         expected = base64.urlsafe_b64encode(
@@ -333,20 +444,17 @@ class TestOAuthSecurityFeatures:
 
         assert code_challenge == expected
 
-    def test_state_parameter_validation(self):
+    def test_state_parameter_validation(self, oauth_client):
         """Test OAuth state parameter generation and validation"""
 
-        from hitl_cli.auth import OAuthDynamicClient
-        client = OAuthDynamicClient()
-
         # Test state generation
-        state = client._generate_state()
+        state = oauth_client._generate_state()
 
         # Verify length and randomness
         assert len(state) >= 32
 
         # Test multiple generations are different
-        state2 = client._generate_state()
+        state2 = oauth_client._generate_state()
         assert state != state2
 
     def test_token_storage_security(self, tmp_path):
@@ -367,10 +475,10 @@ class TestOAuthSecurityFeatures:
                 save_oauth_token(token_data)
 
                 # Verify directory permissions (700)
-                assert oct(config_dir.stat().st_mode)[-3:] == '700'
+                assert stat.S_IMODE(config_dir.stat().st_mode) == 0o700
 
                 # Verify file permissions (600)
-                assert oct(token_file.stat().st_mode)[-3:] == '600'
+                assert stat.S_IMODE(token_file.stat().st_mode) == 0o600
 
     def test_token_expiry_handling(self):
         """Test OAuth token expiry detection and handling"""
@@ -395,6 +503,23 @@ class TestOAuthSecurityFeatures:
         no_expiry_token = {}
         assert is_oauth_token_expired(no_expiry_token)
 
+        # Test token inside the 5-minute refresh window
+        expiring_token = {
+            "expires_at": int(time.time()) + 120  # Expires in 2 minutes
+        }
+        assert is_oauth_token_expired(expiring_token)
+        assert not is_oauth_token_expired(expiring_token, buffer_s=0)
+
+        # A fresh token living no longer than the refresh window is still usable
+        short_lived_token = {
+            "expires_in": 120,
+            "expires_at": int(time.time()) + 120
+        }
+        assert not is_oauth_token_expired(short_lived_token)
+        # ...until it passes the middle of its lifetime
+        short_lived_token["expires_at"] = int(time.time()) + 50
+        assert is_oauth_token_expired(short_lived_token)
+
 
 class TestCLIFlags:
     """Test new CLI flags for dynamic OAuth"""
@@ -11,11 +11,17 @@ These tests validate:
 7. Error handling
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, create_autospec, patch
 
 import pytest
+from hitl_cli.api_client import ApiClient
 from hitl_cli.sdk import HITL
 
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+# Built once: autospeccing introspects every ApiClient method, and async methods become AsyncMocks
+_API_CLIENT_SPEC = create_autospec(ApiClient, instance=True)
+
 
 class TestHITLSDK:
     """Test HITL SDK functionality"""
@@ -25,7 +31,14 @@ class TestHITLSDK:
         """Create a HITL SDK client for testing"""
         return HITL()
 
-    def test_initialization(self, hitl_client):
+    @pytest.fixture
+    def mock_api_client(self):
+        """Patch ApiClient with the shared autospec, reset so no calls or results leak between tests"""
+        _API_CLIENT_SPEC.reset_mock(return_value=True, side_effect=True)
+        with patch('hitl_cli.api_client.ApiClient', return_value=_API_CLIENT_SPEC):
+            yield _API_CLIENT_SPEC
+
+    async def test_initialization(self, hitl_client):
         """Test that HITL client initializes correctly"""
         assert hitl_client is not None
         assert hasattr(hitl_client, '_mcp_client')
@@ -33,29 +46,25 @@ class TestHITLSDK:
 
     @patch('hitl_cli.auth.is_using_api_key')
     @patch('hitl_cli.auth.is_using_oauth')
-    def test_request_input_api_key_auth(self, mock_oauth, mock_api_key, hitl_client):
+    async def test_request_input_api_key_auth(self, mock_oauth, mock_api_key, hitl_client, mock_api_client):
         """Test request_input with API key authentication"""
         mock_api_key.return_value = True
         mock_oauth.return_value = False
 
-        with patch('hitl_cli.api_client.ApiClient') as mock_api_client_class:
-            mock_api_client = MagicMock()
-            mock_api_client_class.return_value = mock_api_client
-            mock_api_client.request_human_input = AsyncMock(return_value="User response")
+        mock_api_client.request_human_input.return_value = "User response"
 
-            import asyncio
-            result = asyncio.run(hitl_client.request_input("Test prompt", ["Yes", "No"]))
+        result = await hitl_client.request_input("Test prompt", ["Yes", "No"])
 
-            assert result == "User response"
-            mock_api_client.request_human_input.assert_called_once_with(
-                prompt="Test prompt",
-                choices=["Yes", "No"],
-                placeholder_text=None
-            )
+        assert result == "User response"
+        mock_api_client.request_human_input.assert_called_once_with(
+            prompt="Test prompt",
+            choices=["Yes", "No"],
+            placeholder_text=None
+        )
 
     @patch('hitl_cli.auth.is_using_api_key')
     @patch('hitl_cli.auth.is_using_oauth')
-    def test_request_input_oauth_auth(self, mock_oauth, mock_api_key, hitl_client):
+    async def test_request_input_oauth_auth(self, mock_oauth, mock_api_key, hitl_client):
         """Test request_input with OAuth authentication"""
         mock_api_key.return_value = False
         mock_oauth.return_value = True
@@ -63,8 +72,7 @@ class TestHITLSDK:
         with patch.object(hitl_client._mcp_client, 'request_human_input_oauth', new_callable=AsyncMock) as mock_request:
             mock_request.return_value = "OAuth response"
 
-            import asyncio
-            result = asyncio.run(hitl_client.request_input("Test prompt", agent_name="Test Agent"))
+            result = await hitl_client.request_input("Test prompt", agent_name="Test Agent")
 
             assert result == "OAuth response"
             mock_request.assert_called_once_with(
@@ -76,7 +84,7 @@ class TestHITLSDK:
 
     @patch('hitl_cli.auth.is_using_api_key')
     @patch('hitl_cli.auth.is_using_oauth')
-    def test_request_input_fallback_auth(self, mock_oauth, mock_api_key, hitl_client):
+    async def test_request_input_fallback_auth(self, mock_oauth, mock_api_key, hitl_client):
         """Test request_input with fallback authentication"""
         mock_api_key.return_value = False
         mock_oauth.return_value = False
@@ -84,8 +92,7 @@ class TestHITLSDK:
         with patch.object(hitl_client._mcp_client, 'request_human_input', new_callable=AsyncMock) as mock_request:
             mock_request.return_value = "Fallback response"
 
-            import asyncio
-            result = asyncio.run(hitl_client.request_input("Test prompt"))
+            result = await hitl_client.request_input("Test prompt")
 
             assert result == "Fallback response"
             mock_request.assert_called_once_with(
@@ -95,24 +102,20 @@ class TestHITLSDK:
             )
 
     @patch('hitl_cli.auth.is_using_api_key')
-    def test_notify_completion_api_key_auth(self, mock_api_key, hitl_client):
+    async def test_notify_completion_api_key_auth(self, mock_api_key, hitl_client, mock_api_client):
         """Test notify_completion with API key authentication"""
         mock_api_key.return_value = True
 
-        with patch('hitl_cli.api_client.ApiClient') as mock_api_client_class:
-            mock_api_client = MagicMock()
-            mock_api_client_class.return_value = mock_api_client
-            mock_api_client.notify_task_completion = AsyncMock(return_value="Task completed feedback")
+        mock_api_client.notify_task_completion.return_value = "Task completed feedback"
 
-            import asyncio
-            result = asyncio.run(hitl_client.notify_completion("Task done"))
+        result = await hitl_client.notify_completion("Task done")
 
-            assert result == "Task completed feedback"
-            mock_api_client.notify_task_completion.assert_called_once_with(summary="Task done")
+        assert result == "Task completed feedback"
+        mock_api_client.notify_task_completion.assert_called_once_with(summary="Task done")
 
     @patch('hitl_cli.auth.is_using_api_key')
     @patch('hitl_cli.auth.is_using_oauth')
-    def test_notify_completion_oauth_auth(self, mock_oauth, mock_api_key, hitl_client):
+    async def test_notify_completion_oauth_auth(self, mock_oauth, mock_api_key, hitl_client):
         """Test notify_completion with OAuth authentication"""
         mock_api_key.return_value = False
         mock_oauth.return_value = True
@@ -120,8 +123,7 @@ class TestHITLSDK:
         with patch.object(hitl_client._mcp_client, 'notify_task_completion_oauth', new_callable=AsyncMock) as mock_notify:
             mock_notify.return_value = "OAuth feedback"
 
-            import asyncio
-            result = asyncio.run(hitl_client.notify_completion("Task done", agent_name="Test Agent"))
+            result = await hitl_client.notify_completion("Task done", agent_name="Test Agent")
 
             assert result == "OAuth feedback"
             mock_notify.assert_called_once_with(
@@ -130,24 +132,20 @@ class TestHITLSDK:
             )
 
     @patch('hitl_cli.auth.is_using_api_key')
-    def test_notify_api_key_auth(self, mock_api_key, hitl_client):
+    async def test_notify_api_key_auth(self, mock_api_key, hitl_client, mock_api_client):
         """Test notify with API key authentication"""
         mock_api_key.return_value = True
 
-        with patch('hitl_cli.api_client.ApiClient') as mock_api_client_class:
-            mock_api_client = MagicMock()
-            mock_api_client_class.return_value = mock_api_client
-            mock_api_client.notify_human = AsyncMock(return_value="Notification sent")
+        mock_api_client.notify_human.return_value = "Notification sent"
 
-            import asyncio
-            result = asyncio.run(hitl_client.notify("Hello world"))
+        result = await hitl_client.notify("Hello world")
 
-            assert result == "Notification sent"
-            mock_api_client.notify_human.assert_called_once_with(message="Hello world")
+        assert result == "Notification sent"
+        mock_api_client.notify_human.assert_called_once_with(message="Hello world")
 
     @patch('hitl_cli.auth.is_using_oauth')
     @patch('hitl_cli.auth.is_using_api_key')
-    def test_notify_oauth_auth(self, mock_api_key, mock_oauth, hitl_client):
+    async def test_notify_oauth_auth(self, mock_api_key, mock_oauth, hitl_client):
         """Test notify with OAuth authentication"""
         mock_api_key.return_value = False
         mock_oauth.return_value = True
@@ -155,8 +153,7 @@ class TestHITLSDK:
         with patch.object(hitl_client._mcp_client, 'notify_human_oauth', new_callable=AsyncMock) as mock_notify:
             mock_notify.return_value = "OAuth notification sent"
 
-            import asyncio
-            result = asyncio.run(hitl_client.notify("Hello world", agent_name="Test Agent"))
+            result = await hitl_client.notify("Hello world", agent_name="Test Agent")
 
             assert result == "OAuth notification sent"
             mock_notify.assert_called_once_with(
@@ -164,67 +161,50 @@ class TestHITLSDK:
                 agent_name="Test Agent"
             )
 
-    def test_create_agent(self, hitl_client):
+    async def test_create_agent(self, hitl_client):
         """Test agent creation"""
         with patch.object(hitl_client._mcp_client, 'create_agent_for_mcp', new_callable=AsyncMock) as mock_create:
             mock_create.return_value = "agent-123"
 
-            import asyncio
-            result = asyncio.run(hitl_client.create_agent("Test Agent"))
+            result = await hitl_client.create_agent("Test Agent")
 
             assert result == "agent-123"
             mock_create.assert_called_once_with("Test Agent")
 
-    def test_list_agents(self, hitl_client):
+    async def test_list_agents(self, hitl_client, mock_api_client):
         """Test listing agents"""
         mock_agents = [
             {"id": "agent-1", "name": "Agent One"},
             {"id": "agent-2", "name": "Agent Two"}
         ]
 
-        with patch('hitl_cli.api_client.ApiClient') as mock_api_client_class:
-            mock_api_client = MagicMock()
-            mock_api_client_class.return_value = mock_api_client
-            mock_api_client.get = AsyncMock(return_value=mock_agents)
+        mock_api_client.get.return_value = mock_agents
 
-            import asyncio
-            result = asyncio.run(hitl_client.list_agents())
+        result = await hitl_client.list_agents()
 
-            assert result == mock_agents
-            mock_api_client.get.assert_called_once_with("/api/v1/agents")
+        assert result == mock_agents
+        mock_api_client.get.assert_called_once_with("/api/v1/agents")
 
-    def test_request_input_error_handling(self, hitl_client):
+    async def test_request_input_error_handling(self, hitl_client, mock_api_client):
         """Test error handling in request_input"""
         with patch('hitl_cli.auth.is_using_api_key', return_value=True):
-            with patch('hitl_cli.api_client.ApiClient') as mock_api_client_class:
-                mock_api_client = MagicMock()
-                mock_api_client_class.return_value = mock_api_client
-                mock_api_client.request_human_input = AsyncMock(side_effect=Exception("Network error"))
+            mock_api_client.request_human_input.side_effect = Exception("Network error")
 
-                import asyncio
-                with pytest.raises(Exception, match="Network error"):
-                    asyncio.run(hitl_client.request_input("Test prompt"))
+            with pytest.raises(Exception, match="Network error"):
+                await hitl_client.request_input("Test prompt")
 
-    def test_notify_completion_error_handling(self, hitl_client):
+    async def test_notify_completion_error_handling(self, hitl_client, mock_api_client):
         """Test error handling in notify_completion"""
         with patch('hitl_cli.auth.is_using_api_key', return_value=True):
-            with patch('hitl_cli.api_client.ApiClient') as mock_api_client_class:
-                mock_api_client = MagicMock()
-                mock_api_client_class.return_value = mock_api_client
-                mock_api_client.notify_task_completion = AsyncMock(side_effect=Exception("Authentication failed"))
+            mock_api_client.notify_task_completion.side_effect = Exception("Authentication failed")
 
-                import asyncio
-                with pytest.raises(Exception, match="Authentication failed"):
-                    asyncio.run(hitl_client.notify_completion("Task done"))
+            with pytest.raises(Exception, match="Authentication failed"):
+                await hitl_client.notify_completion("Task done")
 
-    def test_notify_error_handling(self, hitl_client):
+    async def test_notify_error_handling(self, hitl_client, mock_api_client):
         """Test error handling in notify"""
         with patch('hitl_cli.auth.is_using_api_key', return_value=True):
-            with patch('hitl_cli.api_client.ApiClient') as mock_api_client_class:
-                mock_api_client = MagicMock()
-                mock_api_client_class.return_value = mock_api_client
-                mock_api_client.notify_human = AsyncMock(side_effect=Exception("Send failed"))
-
-                import asyncio
-                with pytest.raises(Exception, match="Send failed"):
-                    asyncio.run(hitl_client.notify("Hello world"))
+            mock_api_client.notify_human.side_effect = Exception("Send failed")
+
+            with pytest.raises(Exception, match="Send failed"):
+                await hitl_client.notify("Hello world")
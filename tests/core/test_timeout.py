@@ -1,84 +1,54 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 from hitl_cli.api_client import ApiClient
 
 
-@pytest.mark.asyncio
-async def test_request_human_input_timeout():
-    """Test that request_human_input uses 900s timeout"""
-    client = ApiClient()
-    with patch('httpx.AsyncClient') as mock_client_class:
-        mock_instance = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_instance
+@pytest.fixture
+def mock_api_http(mock_http):
+    """Serve the shared API HTTP client from an in-memory router"""
+    client, router = mock_http
+    with patch('hitl_cli.api_client._get_api_http', return_value=client), \
+         patch.object(ApiClient, '_get_headers', return_value={}):
+        yield router
 
-        # Mock successful response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"response": "approved"}
-        mock_instance.post.return_value = mock_response
 
-        with patch.object(ApiClient, '_get_headers', return_value={}):
-            await client.request_human_input("test prompt")
+async def test_request_human_input_timeout(mock_api_http):
+    """Test that request_human_input uses 900s timeout"""
+    mock_api_http.add("POST", "/api/v1/hitl/request", 200, {"response": "approved"})
 
-        # Verify httpx.AsyncClient was called with timeout=900.0
-        mock_client_class.assert_called_with(timeout=900.0)
+    assert await ApiClient().request_human_input("test prompt") == "approved"
 
-@pytest.mark.asyncio
-async def test_notify_task_completion_timeout():
-    """Test that notify_task_completion uses 900s timeout"""
-    client = ApiClient()
-    with patch('httpx.AsyncClient') as mock_client_class:
-        mock_instance = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_instance
+    # Verify the request was sent with a 900s read timeout
+    assert len(mock_api_http.calls) == 1
+    assert mock_api_http.calls[0].extensions["timeout"]["read"] == 900.0
 
-        # Mock successful response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"response": "acknowledged"}
-        mock_instance.post.return_value = mock_response
+async def test_notify_task_completion_timeout(mock_api_http):
+    """Test that notify_task_completion uses 900s timeout"""
+    mock_api_http.add("POST", "/api/v1/hitl/complete", 200, {"response": "acknowledged"})
 
-        with patch.object(ApiClient, '_get_headers', return_value={}):
-            await client.notify_task_completion("task done")
+    assert await ApiClient().notify_task_completion("task done") == "acknowledged"
 
-        # Verify httpx.AsyncClient was called with timeout=900.0
-        mock_client_class.assert_called_with(timeout=900.0)
+    # Verify the request was sent with a 900s read timeout
+    assert len(mock_api_http.calls) == 1
+    assert mock_api_http.calls[0].extensions["timeout"]["read"] == 900.0
 
-@pytest.mark.asyncio
-async def test_notify_human_timeout():
+async def test_notify_human_timeout(mock_api_http):
     """Test that notify_human uses 900s timeout"""
-    client = ApiClient()
-    with patch('httpx.AsyncClient') as mock_client_class:
-        mock_instance = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_instance
-
-        # Mock successful response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"status": "sent"}
-        mock_instance.post.return_value = mock_response
+    mock_api_http.add("POST", "/api/v1/hitl/notify", 200, {"status": "sent"})
 
-        with patch.object(ApiClient, '_get_headers', return_value={}):
-            await client.notify_human("hello")
+    assert await ApiClient().notify_human("hello") == "sent"
 
-        # Verify httpx.AsyncClient was called with timeout=900.0
-        mock_client_class.assert_called_with(timeout=900.0)
+    # Verify the request was sent with a 900s read timeout
+    assert len(mock_api_http.calls) == 1
+    assert mock_api_http.calls[0].extensions["timeout"]["read"] == 900.0
 
-@pytest.mark.asyncio
-async def test_default_timeout():
+async def test_default_timeout(mock_api_http):
     """Test that regular get/post use default timeout (30s)"""
-    client = ApiClient()
-    with patch('httpx.AsyncClient') as mock_client_class:
-        mock_instance = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_instance
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {}
-        mock_instance.get.return_value = mock_response
+    mock_api_http.add("GET", "/api/v1/agents", 200, [])
 
-        with patch.object(ApiClient, '_get_headers', return_value={}):
-            await client.get("/api/v1/agents")
+    await ApiClient().get("/api/v1/agents")
 
-        # Verify httpx.AsyncClient was called with timeout=30.0
-        mock_client_class.assert_called_with(timeout=30.0)
+    # Verify the request was sent with the default 30s timeout
+    assert len(mock_api_http.calls) == 1
+    assert mock_api_http.calls[0].extensions["timeout"]["read"] == 30.0
@@ -3,12 +3,16 @@
 
 import json
 import subprocess
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+import typer
 
+from hitl_cli.hooks import codex_notify
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def sample_codex_notification():
     """Sample Codex agent-turn-complete notification."""
     return {
@@ -21,95 +25,127 @@ def sample_codex_notification():
     }
 
 
-def test_codex_notify_parses_json_argument(sample_codex_notification):
-    """Test that codex_notify correctly parses JSON from command line argument."""
-    with patch('subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+@pytest.fixture(scope="session")
+def sample_codex_notification_json(sample_codex_notification):
+    """The sample notification serialized once, as Codex passes it on argv."""
+    return json.dumps(sample_codex_notification)
 
-        # Import and run the hook
-        from hitl_cli.hooks import codex_notify
 
-        # Simulate command line execution
-        json_arg = json.dumps(sample_codex_notification)
-        with patch('sys.argv', ['codex_notify.py', json_arg]):
-            exit_code = codex_notify.main()
+@pytest.fixture
+def mock_do_notify(monkeypatch):
+    """Replace the in-process notification sender."""
+    monkeypatch.delenv("HITL_CODEX_NOTIFY_SUBPROCESS", raising=False)
+    with patch('hitl_cli.hooks.codex_notify._do_notify', new_callable=AsyncMock) as mock_notify:
+        mock_notify.return_value = "Notification sent"
+        yield mock_notify
 
-        # Should exit successfully
-        assert exit_code == 0
 
-        # Should have called hitl-cli notify
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args[0][0]
-        assert call_args[0] == "hitl-cli"
-        assert call_args[1] == "notify"
-        assert "--message" in call_args
+def test_codex_notify_parses_json_argument(sample_codex_notification_json, mock_do_notify):
+    """Test that codex_notify correctly parses JSON from command line argument."""
+    # Simulate command line execution
+    with patch('sys.argv', ['codex_notify.py', sample_codex_notification_json]):
+        exit_code = codex_notify.main()
 
+    # Should exit successfully
+    assert exit_code == 0
 
-def test_codex_notify_formats_message_correctly(sample_codex_notification):
-    """Test that the notification message is formatted correctly."""
-    with patch('subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+    # Should have sent the notification in-process
+    mock_do_notify.assert_awaited_once()
 
-        from hitl_cli.hooks import codex_notify
 
-        json_arg = json.dumps(sample_codex_notification)
-        with patch('sys.argv', ['codex_notify.py', json_arg]):
-            codex_notify.main()
+def test_codex_notify_formats_message_correctly(sample_codex_notification_json, mock_do_notify):
+    """Test that the notification message is formatted correctly."""
+    with patch('sys.argv', ['codex_notify.py', sample_codex_notification_json]):
+        codex_notify.main()
 
-        # Extract the message argument
-        call_args = mock_run.call_args[0][0]
-        message_index = call_args.index("--message") + 1
-        message = call_args[message_index]
+    message = mock_do_notify.await_args.args[0]
 
-        # Verify message contains key information
-        assert "Codex Turn Complete" in message
-        assert "Rename complete and verified `cargo build` succeeds." in message
-        assert "Rename `foo` to `bar`" in message
-        assert "/Users/alice/projects/example" in message
+    # Verify message contains key information
+    assert "Codex Turn Complete" in message
+    assert "Rename complete and verified `cargo build` succeeds." in message
+    assert "Rename `foo` to `bar`" in message
+    assert "/Users/alice/projects/example" in message
 
 
-def test_codex_notify_handles_invalid_json():
-    """Test that invalid JSON is handled gracefully."""
+def test_codex_notify_subprocess_fallback(sample_codex_notification_json, monkeypatch):
+    """Test that the env var switches back to shelling out to hitl-cli."""
+    monkeypatch.setenv("HITL_CODEX_NOTIFY_SUBPROCESS", "1")
     with patch('subprocess.run') as mock_run:
-        from hitl_cli.hooks import codex_notify
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
 
-        invalid_json = "not valid json"
-        with patch('sys.argv', ['codex_notify.py', invalid_json]):
+        with patch('sys.argv', ['codex_notify.py', sample_codex_notification_json]):
             exit_code = codex_notify.main()
 
-        # Should exit with error code
-        assert exit_code == 1
+    assert exit_code == 0
+    mock_run.assert_called_once()
+    call_args = mock_run.call_args[0][0]
+    assert call_args[0] == "hitl-cli"
+    assert call_args[1] == "notify"
+    assert "--message" in call_args
 
-        # Should not call hitl-cli
-        mock_run.assert_not_called()
 
+def test_codex_notify_handles_invalid_json(mock_do_notify):
+    """Test that invalid JSON is handled gracefully."""
+    invalid_json = "not valid json"
+    with patch('sys.argv', ['codex_notify.py', invalid_json]):
+        exit_code = codex_notify.main()
 
-def test_codex_notify_handles_missing_argument():
+    # Should exit with error code
+    assert exit_code == 1
+
+    # Should not send a notification
+    mock_do_notify.assert_not_called()
+
+
+def test_codex_notify_handles_missing_argument(mock_do_notify):
     """Test that missing argument is handled gracefully."""
-    with patch('subprocess.run') as mock_run:
-        from hitl_cli.hooks import codex_notify
+    with patch('sys.argv', ['codex_notify.py']):  # No JSON argument
+        exit_code = codex_notify.main()
+
+    # Should exit with error code
+    assert exit_code == 1
+
+    # Should not send a notification
+    mock_do_notify.assert_not_called()
 
-        with patch('sys.argv', ['codex_notify.py']):  # No JSON argument
-            exit_code = codex_notify.main()
 
-        # Should exit with error code
-        assert exit_code == 1
+def test_codex_notify_handles_send_failure(sample_codex_notification_json, mock_do_notify):
+    """Test that notification failures are handled gracefully."""
+    mock_do_notify.side_effect = httpx.HTTPError("connection refused")
 
-        # Should not call hitl-cli
-        mock_run.assert_not_called()
+    with patch('sys.argv', ['codex_notify.py', sample_codex_notification_json]):
+        exit_code = codex_notify.main()
 
+    # Should exit with error code but not crash
+    assert exit_code == 1
 
-def test_codex_notify_handles_subprocess_failure(sample_codex_notification):
+
+def test_codex_notify_reports_api_error_reason(sample_codex_notification_json, mock_do_notify, capsys):
+    """Test an API error keeps the SDK's output off stdout and reports its reason on stderr."""
+    def fail(message):
+        print("API Error: Invalid API key")
+        raise typer.Exit(1)
+
+    mock_do_notify.side_effect = fail
+
+    with patch('sys.argv', ['codex_notify.py', sample_codex_notification_json]):
+        exit_code = codex_notify.main()
+
+    captured = capsys.readouterr()
+    assert exit_code == 1
+    assert captured.out == ""
+    assert "Failed to send HITL notification: API Error: Invalid API key" in captured.err
+
+
+def test_codex_notify_handles_subprocess_failure(sample_codex_notification_json, monkeypatch):
     """Test that subprocess failures are handled gracefully."""
+    monkeypatch.setenv("HITL_CODEX_NOTIFY_SUBPROCESS", "1")
     with patch('subprocess.run') as mock_run:
         # Simulate subprocess failure
         mock_run.side_effect = subprocess.CalledProcessError(1, "hitl-cli")
 
-        from hitl_cli.hooks import codex_notify
-
-        json_arg = json.dumps(sample_codex_notification)
-        with patch('sys.argv', ['codex_notify.py', json_arg]):
+        with patch('sys.argv', ['codex_notify.py', sample_codex_notification_json]):
             exit_code = codex_notify.main()
 
-        # Should exit with error code but not crash
-        assert exit_code == 1
+    # Should exit with error code but not crash
+    assert exit_code == 1
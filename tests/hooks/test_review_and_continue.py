@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """Tests for the review_and_continue stop hook."""
+import io
 import json
 from unittest.mock import MagicMock, patch
 
@@ -7,11 +8,21 @@ import pytest
 
 from hitl_cli.hooks import review_and_continue
 
+# Completed notify-completion runs, shared read-only across the main hook tests
+_DONE_RESULT = MagicMock(stdout="YOU ARE DONE", returncode=0)
+_README_RESULT = MagicMock(stdout="Please also update the README", returncode=0)
+_LOOKS_GOOD_RESULT = MagicMock(stdout="looks good", returncode=0)
 
-@pytest.fixture
-def temp_transcript_simple(tmp_path):
+
+def _write_jsonl(path, turns):
+    """Write transcript turns as JSONL in a single write."""
+    path.write_bytes("\n".join(map(json.dumps, turns)).encode() + b"\n")
+
+
+@pytest.fixture(scope="module")
+def temp_transcript_simple(tmp_path_factory):
     """Simple transcript with one assistant message."""
-    transcript_file = tmp_path / "transcript.jsonl"
+    transcript_file = tmp_path_factory.mktemp("transcript") / "transcript.jsonl"
     turns = [
         {
             "type": "assistant",
@@ -23,16 +34,14 @@ def temp_transcript_simple(tmp_path):
             }
         }
     ]
-    with open(transcript_file, "w") as f:
-        for turn in turns:
-            f.write(json.dumps(turn) + "\n")
+    _write_jsonl(transcript_file, turns)
     return str(transcript_file)
 
 
-@pytest.fixture
-def temp_transcript_with_progress(tmp_path):
+@pytest.fixture(scope="module")
+def temp_transcript_with_progress(tmp_path_factory):
     """Transcript with assistant message followed by progress events."""
-    transcript_file = tmp_path / "transcript.jsonl"
+    transcript_file = tmp_path_factory.mktemp("transcript") / "transcript.jsonl"
     turns = [
         {
             "type": "assistant",
@@ -48,16 +57,14 @@ def temp_transcript_with_progress(tmp_path):
             "data": {"type": "hook_progress", "hookEvent": "Stop"}
         }
     ]
-    with open(transcript_file, "w") as f:
-        for turn in turns:
-            f.write(json.dumps(turn) + "\n")
+    _write_jsonl(transcript_file, turns)
     return str(transcript_file)
 
 
-@pytest.fixture
-def temp_transcript_with_tool_calls(tmp_path):
+@pytest.fixture(scope="module")
+def temp_transcript_with_tool_calls(tmp_path_factory):
     """Transcript where last assistant message is followed by tool calls."""
-    transcript_file = tmp_path / "transcript.jsonl"
+    transcript_file = tmp_path_factory.mktemp("transcript") / "transcript.jsonl"
     turns = [
         {
             "type": "assistant",
@@ -105,16 +112,14 @@ def temp_transcript_with_tool_calls(tmp_path):
             "data": {"type": "hook_progress"}
         }
     ]
-    with open(transcript_file, "w") as f:
-        for turn in turns:
-            f.write(json.dumps(turn) + "\n")
+    _write_jsonl(transcript_file, turns)
     return str(transcript_file)
 
 
-@pytest.fixture
-def temp_transcript_claude_code_format(tmp_path):
+@pytest.fixture(scope="module")
+def temp_transcript_claude_code_format(tmp_path_factory):
     """Transcript in Claude Code's actual format (message.role instead of type)."""
-    transcript_file = tmp_path / "transcript.jsonl"
+    transcript_file = tmp_path_factory.mktemp("transcript") / "transcript.jsonl"
     turns = [
         {
             "message": {
@@ -145,12 +150,37 @@ def temp_transcript_claude_code_format(tmp_path):
             "data": {"type": "hook_progress", "hookEvent": "Stop"}
         }
     ]
-    with open(transcript_file, "w") as f:
-        for turn in turns:
-            f.write(json.dumps(turn) + "\n")
+    _write_jsonl(transcript_file, turns)
     return str(transcript_file)
 
 
+@pytest.fixture(scope="module")
+def temp_transcript_large(tmp_path_factory):
+    """Multi-megabyte transcript whose final assistant message spans several read chunks."""
+    transcript_file = tmp_path_factory.mktemp("transcript") / "transcript.jsonl"
+    filler = {
+        "type": "user",
+        "message": {"role": "user", "content": [{"type": "tool_result", "content": "x" * 200}]}
+    }
+    final = {
+        "type": "assistant",
+        "message": {
+            "role": "assistant",
+            "content": [{"type": "text", "text": "Final summary. " + "y" * 200_000}]
+        }
+    }
+    _write_jsonl(transcript_file, [filler] * 20_000 + [final])
+    return str(transcript_file)
+
+
+@pytest.fixture
+def hook_stdin(monkeypatch):
+    """Feed a Stop hook payload to main() through a real stdin stream."""
+    def _set(payload):
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(payload)))
+    return _set
+
+
 def test_get_last_assistant_message_simple(temp_transcript_simple):
     """Test basic extraction of assistant message."""
     output = review_and_continue.get_last_assistant_message(temp_transcript_simple)
@@ -182,93 +212,92 @@ def test_get_last_assistant_message_claude_code_format(temp_transcript_claude_co
     assert "All tests pass" not in output
 
 
+def test_get_last_assistant_message_reads_only_tail(temp_transcript_large):
+    """Test that a large transcript is scanned from the end without parsing earlier lines."""
+    with patch(
+        "hitl_cli.hooks.review_and_continue.json.loads", wraps=json.loads
+    ) as mock_loads:
+        output = review_and_continue.get_last_assistant_message(temp_transcript_large)
+
+    assert output.startswith("Final summary.")
+    assert len(output) == len("Final summary. ") + 200_000
+    assert mock_loads.call_count == 1
+
+
+@pytest.mark.parametrize("content", [b"", b"one", b"one\n", b"first\n\nthird line\n" + b"x" * 50 + b"\nlast"])
+def test_iter_lines_reversed_matches_forward_split(tmp_path, content):
+    """Test lines spanning many small chunks come back whole and in reverse order."""
+    path = tmp_path / "lines.jsonl"
+    path.write_bytes(content)
+
+    lines = list(review_and_continue._iter_lines_reversed(str(path), chunk_size=4))
+
+    assert lines == content.split(b"\n")[::-1]
+
+
 def test_get_last_assistant_message_file_not_found():
     """Test handling of missing transcript file."""
     output = review_and_continue.get_last_assistant_message("/nonexistent/path.jsonl")
     assert "Error" in output or "not found" in output.lower()
 
 
-def test_main_hook_allows_stop_on_explicit_done(temp_transcript_simple):
+@patch("hitl_cli.hooks.review_and_continue.subprocess.run", return_value=_DONE_RESULT)
+def test_main_hook_allows_stop_on_explicit_done(mock_run, temp_transcript_simple, hook_stdin, capsys):
     """Test that 'YOU ARE DONE' allows Claude to stop."""
-    input_data = {"transcript_path": temp_transcript_simple}
+    hook_stdin({"transcript_path": temp_transcript_simple})
 
-    with patch("hitl_cli.hooks.review_and_continue.json.load", return_value=input_data):
-        with patch("hitl_cli.hooks.review_and_continue.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout="YOU ARE DONE", returncode=0)
+    with pytest.raises(SystemExit) as exc_info:
+        review_and_continue.main()
 
-            with patch("hitl_cli.hooks.review_and_continue.sys.exit") as mock_exit:
-                mock_exit.side_effect = SystemExit(0)
-                try:
-                    review_and_continue.main()
-                except SystemExit:
-                    pass
+    # Should exit with 0 (allow stop) without a block decision
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == ""
 
-                # Should exit with 0 (allow stop)
-                mock_exit.assert_called_with(0)
 
-
-def test_main_hook_blocks_on_new_instructions(temp_transcript_simple):
+@patch("hitl_cli.hooks.review_and_continue.subprocess.run", return_value=_README_RESULT)
+def test_main_hook_blocks_on_new_instructions(mock_run, temp_transcript_simple, hook_stdin, capsys):
     """Test that new instructions block the stop."""
-    input_data = {"transcript_path": temp_transcript_simple}
+    hook_stdin({"transcript_path": temp_transcript_simple})
 
-    with patch("hitl_cli.hooks.review_and_continue.json.load", return_value=input_data):
-        with patch("hitl_cli.hooks.review_and_continue.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout="Please also update the README", returncode=0)
+    with pytest.raises(SystemExit) as exc_info:
+        review_and_continue.main()
 
-            with patch("hitl_cli.hooks.review_and_continue.sys.exit") as mock_exit:
-                mock_exit.side_effect = SystemExit(0)
-                with patch("builtins.print") as mock_print:
-                    try:
-                        review_and_continue.main()
-                    except SystemExit:
-                        pass
+    assert exc_info.value.code == 0
 
-                    # Should print a block decision
-                    mock_print.assert_called()
-                    call_args = mock_print.call_args[0][0]
-                    output = json.loads(call_args)
-                    assert output["decision"] == "block"
-                    assert "README" in output["reason"]
+    # Should print a block decision
+    output = json.loads(capsys.readouterr().out)
+    assert output["decision"] == "block"
+    assert "README" in output["reason"]
 
 
-def test_main_hook_respects_stop_hook_active():
+@patch("hitl_cli.hooks.review_and_continue.subprocess.run")
+def test_main_hook_respects_stop_hook_active(mock_run, hook_stdin):
     """Test that we don't block when stop_hook_active is true (prevents loops)."""
-    input_data = {
+    hook_stdin({
         "transcript_path": "/some/path.jsonl",
         "stop_hook_active": True
-    }
+    })
 
-    with patch("hitl_cli.hooks.review_and_continue.json.load", return_value=input_data):
-        with patch("hitl_cli.hooks.review_and_continue.sys.exit") as mock_exit:
-            mock_exit.side_effect = SystemExit(0)
-            try:
-                review_and_continue.main()
-            except SystemExit:
-                pass
+    with patch("builtins.open") as mock_open, pytest.raises(SystemExit) as exc_info:
+        review_and_continue.main()
 
-            # Should exit immediately with 0 (allow stop)
-            mock_exit.assert_called_once_with(0)
+    # Should exit immediately with 0 (allow stop)
+    assert exc_info.value.code == 0
+    # Should not touch the transcript or ask the human at all
+    mock_open.assert_not_called()
+    mock_run.assert_not_called()
 
 
-def test_main_hook_blocks_on_any_response_except_explicit_done(temp_transcript_simple):
+@patch("hitl_cli.hooks.review_and_continue.subprocess.run", return_value=_LOOKS_GOOD_RESULT)
+def test_main_hook_blocks_on_any_response_except_explicit_done(mock_run, temp_transcript_simple, hook_stdin, capsys):
     """Test that any response except 'YOU ARE DONE' blocks and continues."""
-    input_data = {"transcript_path": temp_transcript_simple}
-
-    with patch("hitl_cli.hooks.review_and_continue.json.load", return_value=input_data):
-        with patch("hitl_cli.hooks.review_and_continue.subprocess.run") as mock_run:
-            # Any response that isn't exactly "YOU ARE DONE" should block
-            mock_run.return_value = MagicMock(stdout="looks good", returncode=0)
-
-            with patch("hitl_cli.hooks.review_and_continue.sys.exit") as mock_exit:
-                mock_exit.side_effect = SystemExit(0)
-                with patch("builtins.print") as mock_print:
-                    try:
-                        review_and_continue.main()
-                    except SystemExit:
-                        pass
-
-                    # Should print a block decision, NOT allow stop
-                    mock_print.assert_called()
-                    call_args = mock_print.call_args[0][0]
-                    output = json.loads(call_args)
-                    assert output["decision"] == "block"
+    hook_stdin({"transcript_path": temp_transcript_simple})
+
+    with pytest.raises(SystemExit) as exc_info:
+        review_and_continue.main()
+
+    assert exc_info.value.code == 0
+
+    # Any response that isn't exactly "YOU ARE DONE" should print a block decision, NOT allow stop
+    output = json.loads(capsys.readouterr().out)
+    assert output["decision"] == "block"